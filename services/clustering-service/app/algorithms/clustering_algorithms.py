@@ -1,16 +1,96 @@
+import hashlib
+import os
 import numpy as np
+import torch
+from collections import OrderedDict
+from scipy import sparse
 from sklearn.cluster import KMeans, DBSCAN, AgglomerativeClustering
 from sklearn.metrics import silhouette_score
 import hdbscan
 import logging
-from typing import Optional
+import threading
+from typing import NamedTuple, Optional
 from enum import Enum
 from sentence_transformers import SentenceTransformer
+from sorti365_shared import OnnxEncoder
 from ..config import get_settings
 
+try:
+    import faiss
+except ImportError:  # Fall back to scikit-learn when FAISS is not installed
+    faiss = None
+
+try:
+    import numba
+except ImportError:  # Fall back to NumPy when Numba is not installed
+    numba = None
+
 logger = logging.getLogger(__name__)
 
 
+if numba is not None:
+
+    # Not parallel=True: callers already run concurrently on the route
+    # thread pool, and Numba's workqueue layer is not thread-safe
+    @numba.njit(fastmath=True, cache=True)
+    def _topk_cosine(query, matrix, threshold, top_k):
+        """
+        Score pre-normalized rows against a query and keep the best top_k.
+
+        Returns (indices, similarities) sorted by descending similarity,
+        limited to rows scoring at least `threshold`.
+        """
+        n, d = matrix.shape
+        sims = np.empty(n, dtype=np.float32)
+        for i in range(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += matrix[i, j] * query[j]
+            sims[i] = acc
+
+        # Partial top-k: insertion into a small buffer sorted descending
+        k = min(top_k, n)
+        best_idx = np.empty(k, dtype=np.int64)
+        best_sim = np.empty(k, dtype=np.float32)
+        count = 0
+        for i in range(n):
+            sim = sims[i]
+            if sim < threshold:
+                continue
+            if count < k:
+                pos = count
+                count += 1
+            elif sim > best_sim[k - 1]:
+                pos = k - 1
+            else:
+                continue
+            while pos > 0 and best_sim[pos - 1] < sim:
+                best_sim[pos] = best_sim[pos - 1]
+                best_idx[pos] = best_idx[pos - 1]
+                pos -= 1
+            best_sim[pos] = sim
+            best_idx[pos] = i
+
+        return best_idx[:count], best_sim[:count]
+
+else:
+
+    def _topk_cosine(query, matrix, threshold, top_k):
+        """
+        Score pre-normalized rows against a query and keep the best top_k.
+
+        Returns (indices, similarities) sorted by descending similarity,
+        limited to rows scoring at least `threshold`.
+        """
+        sims = matrix @ query
+        k = min(top_k, len(sims))
+        # O(N) partial selection, then sort only the k survivors
+        indices = np.argpartition(-sims, k - 1)[:k]
+        indices = indices[np.argsort(-sims[indices])]
+        indices = indices[sims[indices] >= threshold]
+        return indices, sims[indices]
+
+
 class ClusteringMethod(str, Enum):
     """Available clustering methods."""
     KMEANS = "kmeans"
@@ -19,30 +99,146 @@ class ClusteringMethod(str, Enum):
     AGGLOMERATIVE = "agglomerative"
 
 
+class Corpus(NamedTuple):
+    """Encoded similarity-search corpus."""
+    texts: list[str]
+    embeddings: np.ndarray  # L2-normalized float32, one row per text
+    index: Optional["faiss.Index"] = None  # HNSW index for large corpora
+
+
 class ClusteringAlgorithms:
     """Clustering algorithms for grouping similar texts/queries."""
 
     def __init__(self):
         self.settings = get_settings()
         self._model = None
+        self._embedding_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._corpus_cache: OrderedDict[str, Corpus] = OrderedDict()
+        self._pinned_corpora: OrderedDict[str, Corpus] = OrderedDict()
+        # Routes call into this instance from a thread pool
+        self._model_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+        # Clustering dispatch table: method -> adapter(embeddings, params)
+        self._methods = {
+            ClusteringMethod.KMEANS: lambda emb, p: self._kmeans_cluster(
+                emb, p["n_clusters"]
+            ),
+            ClusteringMethod.DBSCAN: lambda emb, p: self._dbscan_cluster(
+                emb, eps=p["eps"], min_samples=p["min_samples"]
+            ),
+            ClusteringMethod.HDBSCAN: lambda emb, p: self._hdbscan_cluster(
+                emb,
+                min_cluster_size=p["min_cluster_size"],
+                min_samples=p["min_samples"],
+                return_probabilities=p["return_probabilities"],
+            ),
+            ClusteringMethod.AGGLOMERATIVE: lambda emb, p: self._agglomerative_cluster(
+                emb, p["n_clusters"]
+            ),
+        }
 
     @property
     def embedding_model(self):
         """Lazy load sentence transformer model."""
         if self._model is None:
-            try:
-                self._model = SentenceTransformer(self.settings.embedding_model)
-                logger.info(f"Loaded embedding model: {self.settings.embedding_model}")
-            except Exception as e:
-                logger.error(f"Failed to load embedding model: {str(e)}")
-                self._model = None
+            with self._model_lock:
+                if self._model is None:
+                    self._load_model()
         return self._model
 
+    def _load_model(self) -> None:
+        """Load the embedding model for the configured backend."""
+        try:
+            if self.settings.embedding_backend == "onnx":
+                self._model = OnnxEncoder(
+                    self.settings.embedding_model,
+                    quantize=self.settings.onnx_quantize,
+                    max_seq_length=self.settings.onnx_max_seq_length,
+                    cache_dir=self.settings.onnx_cache_dir,
+                )
+            else:
+                self._model = SentenceTransformer(self.settings.embedding_model)
+                self._configure_model_device()
+            logger.info(
+                f"Loaded embedding model: {self.settings.embedding_model} "
+                f"({self.settings.embedding_backend})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load embedding model: {str(e)}")
+            self._model = None
+
+    def _configure_model_device(self) -> None:
+        """Run in FP16 on GPU; on CPU keep FP32 and use every core."""
+        if torch.cuda.is_available():
+            self._model = self._model.half().to("cuda")
+        else:
+            self._model = self._model.to(torch.float32)
+            torch.set_num_threads(os.cpu_count() or 1)
+
     def get_embeddings(self, texts: list[str]) -> np.ndarray:
-        """Get embeddings for a list of texts."""
+        """
+        Get embeddings for a list of texts.
+
+        Embeddings are L2-normalized float32 vectors. They are cached per
+        text, so only cache misses go through the model (in a single batch).
+        Row order matches the input order.
+        """
         if self.embedding_model is None:
             raise ValueError("Embedding model not available")
-        return self.embedding_model.encode(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        keys = [hashlib.sha1(text.encode("utf-8")).digest() for text in texts]
+        cached = [self._cache_get(key) for key in keys]
+
+        # Collect unique misses so repeated texts are encoded once
+        misses: dict[bytes, str] = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None:
+                misses.setdefault(key, text)
+
+        encoded: dict[bytes, np.ndarray] = {}
+        if misses:
+            vectors = np.asarray(
+                self.embedding_model.encode(
+                    list(misses.values()),
+                    batch_size=self.settings.encode_batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False,
+                ),
+                dtype=np.float32,
+            )
+            for key, vector in zip(misses, vectors):
+                encoded[key] = vector
+                # Copy so the cached row doesn't keep the whole batch alive
+                self._cache_put(key, vector.copy())
+
+        # Scatter cached and freshly encoded vectors back into input order
+        first = cached[0] if cached[0] is not None else encoded[keys[0]]
+        embeddings = np.empty((len(texts), first.shape[0]), dtype=np.float32)
+        for i, (key, vector) in enumerate(zip(keys, cached)):
+            embeddings[i] = vector if vector is not None else encoded[key]
+        return embeddings
+
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a cached embedding, marking it as recently used."""
+        with self._cache_lock:
+            vector = self._embedding_cache.get(key)
+            if vector is not None:
+                self._embedding_cache.move_to_end(key)
+            return vector
+
+    def _cache_put(self, key: bytes, vector: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entries."""
+        if self.settings.embedding_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._embedding_cache[key] = vector
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self.settings.embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
 
     def cluster_texts(
         self,
@@ -52,6 +248,7 @@ class ClusteringAlgorithms:
         min_cluster_size: Optional[int] = None,
         min_samples: Optional[int] = None,
         eps: Optional[float] = None,
+        return_probabilities: bool = False,
     ) -> dict:
         """
         Cluster texts using the specified method.
@@ -63,6 +260,7 @@ class ClusteringAlgorithms:
             min_cluster_size: Minimum cluster size (for HDBSCAN)
             min_samples: Minimum samples (for DBSCAN/HDBSCAN)
             eps: Epsilon parameter (for DBSCAN)
+            return_probabilities: Include membership probabilities (for HDBSCAN)
 
         Returns:
             Dictionary with cluster assignments and metadata
@@ -75,31 +273,8 @@ class ClusteringAlgorithms:
                 "n_clusters": 0,
             }
 
-        # Get embeddings
-        embeddings = self.get_embeddings(texts)
-
-        # Perform clustering
-        if method == ClusteringMethod.KMEANS:
-            labels, metadata = self._kmeans_cluster(
-                embeddings, n_clusters or self.settings.default_n_clusters
-            )
-        elif method == ClusteringMethod.DBSCAN:
-            labels, metadata = self._dbscan_cluster(
-                embeddings,
-                eps=eps or 0.5,
-                min_samples=min_samples or self.settings.default_min_samples,
-            )
-        elif method == ClusteringMethod.HDBSCAN:
-            labels, metadata = self._hdbscan_cluster(
-                embeddings,
-                min_cluster_size=min_cluster_size or self.settings.default_min_cluster_size,
-                min_samples=min_samples or self.settings.default_min_samples,
-            )
-        elif method == ClusteringMethod.AGGLOMERATIVE:
-            labels, metadata = self._agglomerative_cluster(
-                embeddings, n_clusters or self.settings.default_n_clusters
-            )
-        else:
+        cluster_fn = self._methods.get(method)
+        if cluster_fn is None:
             return {
                 "success": False,
                 "error": f"Unknown method: {method}",
@@ -107,12 +282,40 @@ class ClusteringAlgorithms:
                 "n_clusters": 0,
             }
 
+        # Get embeddings (kept float32 and C-contiguous for every backend)
+        embeddings = np.ascontiguousarray(self.get_embeddings(texts), dtype=np.float32)
+
+        # Perform clustering
+        labels, metadata = cluster_fn(
+            embeddings,
+            {
+                "n_clusters": n_clusters or self.settings.default_n_clusters,
+                "min_cluster_size": min_cluster_size or self.settings.default_min_cluster_size,
+                "min_samples": min_samples or self.settings.default_min_samples,
+                "eps": eps or 0.5,
+                "return_probabilities": return_probabilities,
+            },
+        )
+
+        # Count clusters and noise with NumPy instead of Python loops
+        labels = np.asarray(labels)
+        unique = np.unique(labels)
+        n_noise = int((labels == -1).sum())
+        n_unique = int(len(unique) - (1 if n_noise else 0))
+
         # Calculate silhouette score if we have more than one cluster
-        n_unique = len(set(labels)) - (1 if -1 in labels else 0)
         silhouette = None
-        if n_unique > 1 and n_unique < len(texts):
+        if 1 < n_unique < len(texts) <= self.settings.silhouette_max_n:
             try:
-                silhouette = float(silhouette_score(embeddings, labels))
+                silhouette = float(
+                    silhouette_score(
+                        embeddings,
+                        labels,
+                        metric="cosine",
+                        sample_size=min(len(labels), self.settings.silhouette_sample_size),
+                        random_state=42,
+                    )
+                )
             except Exception:
                 pass
 
@@ -122,9 +325,9 @@ class ClusteringAlgorithms:
         return {
             "success": True,
             "method": method.value,
-            "labels": [int(l) for l in labels],
+            "labels": labels.astype(np.int32).tolist(),
             "n_clusters": n_unique,
-            "n_noise": int(sum(1 for l in labels if l == -1)),
+            "n_noise": n_noise,
             "silhouette_score": round(silhouette, 3) if silhouette else None,
             "clusters": clusters,
             **metadata,
@@ -133,11 +336,19 @@ class ClusteringAlgorithms:
     def _kmeans_cluster(
         self, embeddings: np.ndarray, n_clusters: int
     ) -> tuple[np.ndarray, dict]:
-        """Perform K-means clustering."""
+        """Perform K-means clustering (FAISS when available, else scikit-learn)."""
         # Ensure n_clusters doesn't exceed number of samples
         n_clusters = min(n_clusters, len(embeddings))
 
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        if faiss is not None:
+            return self._faiss_kmeans_cluster(embeddings, n_clusters)
+
+        kmeans = KMeans(
+            n_clusters=n_clusters,
+            random_state=42,
+            n_init=10,
+            algorithm="elkan" if embeddings.shape[1] < 50 else "lloyd",
+        )
         labels = kmeans.fit_predict(embeddings)
 
         return labels, {
@@ -145,6 +356,29 @@ class ClusteringAlgorithms:
             "n_iter": int(kmeans.n_iter_),
         }
 
+    def _faiss_kmeans_cluster(
+        self, embeddings: np.ndarray, n_clusters: int
+    ) -> tuple[np.ndarray, dict]:
+        """Perform K-means clustering with FAISS (BLAS-backed, GPU if present)."""
+        data = np.ascontiguousarray(embeddings, dtype=np.float32)
+        n_iter = 20
+
+        kmeans = faiss.Kmeans(
+            d=data.shape[1],
+            k=n_clusters,
+            niter=n_iter,
+            nredo=3,
+            seed=42,
+            gpu=faiss.get_num_gpus() > 0,
+        )
+        kmeans.train(data)
+        _, labels = kmeans.index.search(data, 1)
+
+        return labels.ravel(), {
+            "inertia": float(kmeans.obj[-1]),
+            "n_iter": n_iter,
+        }
+
     def _dbscan_cluster(
         self, embeddings: np.ndarray, eps: float, min_samples: int
     ) -> tuple[np.ndarray, dict]:
@@ -158,7 +392,11 @@ class ClusteringAlgorithms:
         }
 
     def _hdbscan_cluster(
-        self, embeddings: np.ndarray, min_cluster_size: int, min_samples: int
+        self,
+        embeddings: np.ndarray,
+        min_cluster_size: int,
+        min_samples: int,
+        return_probabilities: bool = False,
     ) -> tuple[np.ndarray, dict]:
         """Perform HDBSCAN clustering."""
         # Adjust parameters if we have few samples
@@ -173,44 +411,95 @@ class ClusteringAlgorithms:
         )
         labels = clusterer.fit_predict(embeddings)
 
-        return labels, {
+        metadata = {
             "min_cluster_size": min_cluster_size,
             "min_samples": min_samples,
-            "probabilities": [float(p) for p in clusterer.probabilities_],
         }
+        if return_probabilities:
+            metadata["probabilities"] = clusterer.probabilities_.astype(np.float32).tolist()
+
+        return labels, metadata
 
     def _agglomerative_cluster(
         self, embeddings: np.ndarray, n_clusters: int
     ) -> tuple[np.ndarray, dict]:
-        """Perform Agglomerative clustering."""
+        """Perform Agglomerative clustering (average linkage, cosine distance)."""
         n_clusters = min(n_clusters, len(embeddings))
+        n_neighbors = self.settings.agglomerative_n_neighbors
+
+        if (
+            faiss is not None
+            and len(embeddings) >= self.settings.agglomerative_knn_min_size
+            and len(embeddings) > n_neighbors + 1
+        ):
+            # Sparse k-NN connectivity keeps memory at O(N·k) instead of O(N²)
+            clustering = AgglomerativeClustering(
+                n_clusters=n_clusters,
+                connectivity=self._knn_connectivity(embeddings, n_neighbors),
+                metric="cosine",
+                linkage="average",
+            )
+            labels = clustering.fit_predict(embeddings)
+        else:
+            # Embeddings are unit-norm, so cosine distance is 1 - X @ X.T
+            distances = 1.0 - embeddings @ embeddings.T
+            np.maximum(distances, 0.0, out=distances)
+            np.fill_diagonal(distances, 0.0)
 
-        clustering = AgglomerativeClustering(n_clusters=n_clusters)
-        labels = clustering.fit_predict(embeddings)
+            clustering = AgglomerativeClustering(
+                n_clusters=n_clusters, metric="precomputed", linkage="average"
+            )
+            labels = clustering.fit_predict(distances)
 
         return labels, {
             "n_leaves": int(clustering.n_leaves_),
         }
 
+    def _knn_connectivity(
+        self, embeddings: np.ndarray, n_neighbors: int
+    ) -> sparse.csr_matrix:
+        """Build a k-nearest-neighbor connectivity graph with FAISS."""
+        n = len(embeddings)
+        index = faiss.IndexFlatIP(embeddings.shape[1])
+        index.add(embeddings)
+        # +1 because every point is its own nearest neighbor
+        _, neighbors = index.search(embeddings, n_neighbors + 1)
+
+        rows = np.repeat(np.arange(n), neighbors.shape[1])
+        cols = neighbors.ravel()
+        valid = cols >= 0
+        return sparse.csr_matrix(
+            (np.ones(int(valid.sum()), dtype=np.float32), (rows[valid], cols[valid])),
+            shape=(n, n),
+        )
+
     def _build_clusters(
         self, texts: list[str], labels: np.ndarray
     ) -> dict[str, list[str]]:
         """Build cluster dictionary from labels."""
+        labels = np.asarray(labels)
+        if labels.size == 0:
+            return {}
+
+        # Group indices by label with one stable sort and a boundary scan
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+
         clusters = {}
-        for text, label in zip(texts, labels):
+        for group in np.split(order, boundaries):
+            label = labels[group[0]]
             label_key = f"cluster_{label}" if label >= 0 else "noise"
-            if label_key not in clusters:
-                clusters[label_key] = []
-            clusters[label_key].append(text)
+            clusters[label_key] = [texts[i] for i in group]
         return clusters
 
     def find_similar(
         self,
         query: str,
-        texts: list[str],
+        texts: Optional[list[str]] = None,
         top_k: int = 5,
         threshold: float = 0.5,
-    ) -> list[dict]:
+        corpus_id: Optional[str] = None,
+    ) -> tuple[list[dict], int]:
         """
         Find texts most similar to the query.
 
@@ -219,52 +508,124 @@ class ClusteringAlgorithms:
             texts: List of texts to search
             top_k: Number of results to return
             threshold: Minimum similarity threshold
+            corpus_id: Id of a corpus pinned with register_corpus (instead of texts)
 
         Returns:
-            List of dictionaries with text and similarity score
+            List of dictionaries with text and similarity score, and the
+            number of texts in the corpus that was searched
         """
-        if not texts:
-            return []
-
-        # Get embeddings
-        query_embedding = self.embedding_model.encode([query])[0]
-        text_embeddings = self.embedding_model.encode(texts)
-
-        # Calculate cosine similarities
-        similarities = self._cosine_similarity(query_embedding, text_embeddings)
-
-        # Sort by similarity
-        indices = np.argsort(similarities)[::-1]
-
-        # Filter by threshold and return top_k
-        results = []
-        for idx in indices[:top_k]:
-            sim = float(similarities[idx])
-            if sim >= threshold:
-                results.append({
-                    "text": texts[idx],
-                    "similarity": round(sim, 3),
-                    "index": int(idx),
-                })
-
-        return results
-
-    def _cosine_similarity(
-        self, vec1: np.ndarray, vec2: np.ndarray
-    ) -> np.ndarray:
-        """Calculate cosine similarity between vec1 and all vectors in vec2."""
-        vec1_norm = vec1 / np.linalg.norm(vec1)
-
-        if len(vec2.shape) == 1:
-            vec2_norm = vec2 / np.linalg.norm(vec2)
+        if corpus_id is not None:
+            corpus = self._get_pinned_corpus(corpus_id)
+        elif texts:
+            corpus = self._get_corpus(texts)
         else:
-            vec2_norm = vec2 / np.linalg.norm(vec2, axis=1, keepdims=True)
+            return [], 0
+
+        query_embedding = self.get_embeddings([query])[0]
+
+        if corpus.index is not None:
+            scores, indices = corpus.index.search(
+                query_embedding.reshape(1, -1), min(top_k, len(corpus.texts))
+            )
+            scores, indices = scores[0], indices[0]
+        else:
+            # Brute force wins on small corpora
+            indices, scores = _topk_cosine(
+                query_embedding, corpus.embeddings, threshold, top_k
+            )
 
-        return np.dot(vec2_norm, vec1_norm)
+        # Filter by threshold (FAISS pads missing results with -1)
+        mask = (scores >= threshold) & (indices >= 0)
+
+        results = [
+            {
+                "text": corpus.texts[idx],
+                "similarity": round(float(sim), 3),
+                "index": int(idx),
+            }
+            for idx, sim in zip(indices[mask], scores[mask])
+        ]
+        return results, len(corpus.texts)
+
+    def register_corpus(self, texts: list[str]) -> str:
+        """Encode a corpus once and pin it for later similarity searches."""
+        corpus_id = self._corpus_key(texts)
+        with self._cache_lock:
+            if corpus_id in self._pinned_corpora:
+                self._pinned_corpora.move_to_end(corpus_id)
+                return corpus_id
+
+        corpus = self._get_corpus(texts)
+        with self._cache_lock:
+            self._pinned_corpora[corpus_id] = corpus
+            while len(self._pinned_corpora) > self.settings.max_pinned_corpora:
+                self._pinned_corpora.popitem(last=False)
+        return corpus_id
+
+    def _get_pinned_corpus(self, corpus_id: str) -> Corpus:
+        """Look up a pinned corpus by id."""
+        with self._cache_lock:
+            corpus = self._pinned_corpora.get(corpus_id)
+            if corpus is None:
+                raise ValueError(f"Unknown corpus_id: {corpus_id}")
+            self._pinned_corpora.move_to_end(corpus_id)
+            return corpus
+
+    def _get_corpus(self, texts: list[str]) -> Corpus:
+        """
+        Get (or build) the cached embeddings for a corpus.
+
+        Corpora of at least ann_min_corpus_size texts also get an HNSW
+        inner-product index when FAISS is available.
+        """
+        key = self._corpus_key(texts)
+        with self._cache_lock:
+            corpus = self._corpus_cache.get(key)
+            if corpus is not None:
+                self._corpus_cache.move_to_end(key)
+                return corpus
+
+        embeddings = self.get_embeddings(texts)
+        index = None
+        if faiss is not None and len(texts) >= self.settings.ann_min_corpus_size:
+            index = faiss.IndexHNSWFlat(embeddings.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = 128
+            index.add(embeddings)
+
+        corpus = Corpus(texts=list(texts), embeddings=embeddings, index=index)
+        with self._cache_lock:
+            self._corpus_cache[key] = corpus
+            while len(self._corpus_cache) > self.settings.corpus_cache_size:
+                self._corpus_cache.popitem(last=False)
+        return corpus
+
+    @staticmethod
+    def _corpus_key(texts: list[str]) -> str:
+        """Collision-resistant key for a list of texts."""
+        # Length-prefix each text so different lists never share an encoding
+        digest = hashlib.blake2b(digest_size=16)
+        for text in texts:
+            data = text.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def warmup(self) -> None:
+        """Load the model and exercise the hot paths so first requests are fast."""
+        if self.embedding_model is None:
+            logger.warning("Skipping warmup: embedding model not available")
+            return
+        embedding = self.get_embeddings(["warmup"])[0]
+        # Triggers JIT compilation of the top-k kernel
+        _topk_cosine(embedding, embedding.reshape(1, -1), 0.0, 1)
+        logger.info("Embedding model warmed up")
 
     def get_status(self) -> dict:
         """Get service status."""
         return {
             "embedding_model": self.settings.embedding_model,
+            "embedding_backend": self.settings.embedding_backend,
             "embedding_loaded": self._model is not None,
+            "embedding_cache_entries": len(self._embedding_cache),
+            "pinned_corpora": len(self._pinned_corpora),
         }
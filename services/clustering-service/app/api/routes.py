@@ -1,16 +1,23 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from .schemas import (
     ClusterRequest,
     ClusterResponse,
     SimilarityRequest,
     SimilarityResponse,
     SimilarityResult,
+    CorpusRequest,
+    CorpusResponse,
     EmbeddingsRequest,
     EmbeddingsResponse,
     HealthResponse,
-    ClusteringMethod,
 )
+from sorti365_shared import EmbeddingBatcher
 from ..algorithms import ClusteringAlgorithms
 from ..algorithms.clustering_algorithms import ClusteringMethod as AlgoMethod
 from ..config import get_settings
@@ -20,6 +27,21 @@ router = APIRouter()
 clustering = ClusteringAlgorithms()
 settings = get_settings()
 
+# Encoding and clustering are CPU-bound; keep them off the event loop
+executor = ThreadPoolExecutor(max_workers=min(settings.max_workers, os.cpu_count() or 1))
+embedding_batcher = EmbeddingBatcher(
+    clustering.get_embeddings,
+    executor,
+    max_wait_ms=settings.embedding_batch_wait_ms,
+    max_batch=settings.embedding_batch_max_texts,
+)
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """Run a blocking call on the shared worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -37,21 +59,16 @@ async def health_check():
 async def cluster_texts(request: ClusterRequest):
     """Cluster texts using the specified algorithm."""
     try:
-        # Map API enum to algorithm enum
-        method_map = {
-            ClusteringMethod.KMEANS: AlgoMethod.KMEANS,
-            ClusteringMethod.DBSCAN: AlgoMethod.DBSCAN,
-            ClusteringMethod.HDBSCAN: AlgoMethod.HDBSCAN,
-            ClusteringMethod.AGGLOMERATIVE: AlgoMethod.AGGLOMERATIVE,
-        }
-
-        result = clustering.cluster_texts(
+        result = await run_in_executor(
+            clustering.cluster_texts,
             texts=request.texts,
-            method=method_map[request.method],
+            # API and algorithm enums share the same values
+            method=AlgoMethod(request.method.value),
             n_clusters=request.n_clusters,
             min_cluster_size=request.min_cluster_size,
             min_samples=request.min_samples,
             eps=request.eps,
+            return_probabilities=request.return_probabilities,
         )
 
         return ClusterResponse(**result)
@@ -67,17 +84,19 @@ async def cluster_texts(request: ClusterRequest):
 async def find_similar(request: SimilarityRequest):
     """Find texts most similar to the query."""
     try:
-        results = clustering.find_similar(
+        results, total_texts = await run_in_executor(
+            clustering.find_similar,
             query=request.query,
             texts=request.texts,
             top_k=request.top_k,
             threshold=request.threshold,
+            corpus_id=request.corpus_id,
         )
 
         return SimilarityResponse(
             query=request.query,
             results=[SimilarityResult(**r) for r in results],
-            total_texts=len(request.texts),
+            total_texts=total_texts,
         )
 
     except ValueError as e:
@@ -87,15 +106,35 @@ async def find_similar(request: SimilarityRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/embeddings", response_model=EmbeddingsResponse)
+@router.post("/corpus", response_model=CorpusResponse)
+async def register_corpus(request: CorpusRequest):
+    """Encode a corpus once and pin it so /similar can reference it by id."""
+    try:
+        corpus_id = await run_in_executor(clustering.register_corpus, request.texts)
+
+        return CorpusResponse(corpus_id=corpus_id, size=len(request.texts))
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Corpus registration failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/embeddings",
+    response_class=ORJSONResponse,
+    responses={200: {"model": EmbeddingsResponse}},
+)
 async def get_embeddings(request: EmbeddingsRequest):
     """Get embeddings for texts."""
     try:
-        embeddings = clustering.get_embeddings(request.texts)
+        embeddings = await embedding_batcher.encode(request.texts)
 
-        return EmbeddingsResponse(
-            embeddings=[e.tolist() for e in embeddings],
-            dimensions=embeddings.shape[1],
+        # orjson serializes the float32 ndarray directly, skipping per-float
+        # Python conversion and response-model validation
+        return ORJSONResponse(
+            {"embeddings": embeddings, "dimensions": int(embeddings.shape[1])}
         )
 
     except ValueError as e:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
 from enum import Enum
 
@@ -19,6 +19,9 @@ class ClusterRequest(BaseModel):
     min_cluster_size: Optional[int] = Field(None, ge=2)
     min_samples: Optional[int] = Field(None, ge=1)
     eps: Optional[float] = Field(None, gt=0)
+    return_probabilities: bool = Field(
+        False, description="Include HDBSCAN membership probabilities"
+    )
 
 
 class ClusterResponse(BaseModel):
@@ -30,16 +33,24 @@ class ClusterResponse(BaseModel):
     n_noise: Optional[int] = None
     silhouette_score: Optional[float] = None
     clusters: dict[str, list[str]]
+    probabilities: Optional[list[float]] = None
     error: Optional[str] = None
 
 
 class SimilarityRequest(BaseModel):
-    """Request for similarity search."""
+    """Request for similarity search over texts or a pinned corpus."""
     query: str = Field(..., min_length=1)
-    texts: list[str] = Field(..., min_length=1)
+    texts: Optional[list[str]] = Field(None, min_length=1)
+    corpus_id: Optional[str] = Field(None, description="Id returned by /corpus")
     top_k: int = Field(5, ge=1, le=100)
     threshold: float = Field(0.5, ge=0, le=1)
 
+    @model_validator(mode="after")
+    def check_corpus_source(self):
+        if (self.texts is None) == (self.corpus_id is None):
+            raise ValueError("Provide exactly one of texts or corpus_id")
+        return self
+
 
 class SimilarityResult(BaseModel):
     """Single similarity result."""
@@ -55,6 +66,17 @@ class SimilarityResponse(BaseModel):
     total_texts: int
 
 
+class CorpusRequest(BaseModel):
+    """Request to encode and pin a corpus for repeated similarity searches."""
+    texts: list[str] = Field(..., min_length=1)
+
+
+class CorpusResponse(BaseModel):
+    """Response with the id of a pinned corpus."""
+    corpus_id: str
+    size: int
+
+
 class EmbeddingsRequest(BaseModel):
     """Request for text embeddings."""
     texts: list[str] = Field(..., min_length=1)
@@ -72,4 +94,7 @@ class HealthResponse(BaseModel):
     service: str
     version: str
     embedding_model: str
+    embedding_backend: str
     embedding_loaded: bool
+    embedding_cache_entries: int = 0
+    pinned_corpora: int = 0
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +11,46 @@ class Settings(BaseSettings):
     # Embedding model for text clustering
     embedding_model: str = "paraphrase-multilingual-MiniLM-L12-v2"
 
+    # Load and warm up the model at startup instead of on the first request
+    preload_model: bool = True
+
+    # Embedding backend: "torch" (sentence-transformers) or "onnx" (ONNX Runtime)
+    embedding_backend: str = "torch"
+    onnx_quantize: bool = False  # Dynamic INT8 quantization for the ONNX backend
+    onnx_cache_dir: Optional[str] = None  # Reuse exported ONNX models across restarts
+    onnx_max_seq_length: Optional[int] = None  # Defaults to the model's own limit
+
+    # Max number of text embeddings kept in the in-process LRU cache
+    embedding_cache_size: int = 10000
+
+    # Batch size passed to the encoder
+    encode_batch_size: int = 64
+
+    # Similarity search: encoded corpora are cached (and can be pinned via
+    # /corpus); corpora at least ann_min_corpus_size large also get an HNSW
+    # index instead of a brute-force scan
+    ann_min_corpus_size: int = 1000
+    corpus_cache_size: int = 32
+    max_pinned_corpora: int = 64
+
+    # Silhouette score is estimated on a random subsample and skipped
+    # entirely above silhouette_max_n texts
+    silhouette_sample_size: int = 1000
+    silhouette_max_n: int = 50000
+
+    # Worker threads for CPU-bound model/clustering calls
+    max_workers: int = 4
+
+    # /embeddings micro-batching: wait up to this long (or until this many
+    # texts are queued) before issuing one encode call
+    embedding_batch_wait_ms: float = 10.0
+    embedding_batch_max_texts: int = 256
+
+    # Agglomerative clustering switches from the exact O(N²) distance matrix
+    # to a sparse k-NN connectivity graph at agglomerative_knn_min_size texts
+    agglomerative_knn_min_size: int = 5000
+    agglomerative_n_neighbors: int = 15
+
     # Default clustering parameters
     default_min_cluster_size: int = 5
     default_min_samples: int = 3
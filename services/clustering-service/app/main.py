@@ -1,8 +1,11 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 from .config import get_settings
 from .api import router
+from .api.routes import clustering, run_in_executor
 
 # Configure logging
 logging.basicConfig(
@@ -12,12 +15,23 @@ logging.basicConfig(
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Preload and warm up the embedding model before serving requests."""
+    if settings.preload_model:
+        await run_in_executor(clustering.warmup)
+    yield
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Clustering Service for Sorti365 - Text clustering and similarity search",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
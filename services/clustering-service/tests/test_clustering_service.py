@@ -133,6 +133,17 @@ class TestSimilarEndpoint:
             if "similar" in data:
                 assert len(data["similar"]) <= 3
 
+    @patch("app.api.routes.clustering.find_similar", return_value=([], 4))
+    def test_total_texts_is_size_of_searched_corpus(self, mock_find):
+        # No second corpus lookup, so a concurrent eviction cannot fail the request
+        response = client.post("/api/clustering/similar", json={
+            "query": "Quiero verificar mi ticket",
+            "corpus_id": "abc123",
+        })
+
+        assert response.status_code == 200
+        assert response.json()["total_texts"] == 4
+
 
 class TestEmbeddingsEndpoint:
     @patch("app.api.routes.get_embeddings_for_texts")
@@ -154,6 +165,12 @@ class TestEmbeddingsEndpoint:
                 assert len(data["embeddings"]) == 3
 
 
+    def test_openapi_documents_embeddings_response(self):
+        operation = client.get("/openapi.json").json()["paths"]["/api/clustering/embeddings"]["post"]
+        schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["$ref"].endswith("/EmbeddingsResponse")
+
+
 class TestClusteringAlgorithmSelection:
     def test_invalid_algorithm(self):
         response = client.post("/api/clustering/cluster", json={
@@ -210,3 +227,82 @@ class TestCosineSimilarity:
         # Orthogonal vectors should have similarity 0.0
         sim_ortho = algorithms.cosine_similarity(vec1, vec3)
         assert abs(sim_ortho) < 0.001
+
+
+class TestEmbeddingCache:
+    def test_repeated_texts_skip_encoder(self):
+        algorithms = ClusteringAlgorithms()
+        algorithms._model = Mock()
+        algorithms._model.encode.side_effect = (
+            lambda texts, **kwargs: np.random.rand(len(texts), 4)
+        )
+
+        first = algorithms.get_embeddings(["hola", "adios"])
+        second = algorithms.get_embeddings(["adios", "hola", "nuevo"])
+
+        assert algorithms._model.encode.call_count == 2
+        assert algorithms._model.encode.call_args[0][0] == ["nuevo"]
+        assert second.dtype == np.float32
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[1], first[0])
+
+    def test_empty_texts_skip_encoder(self):
+        algorithms = ClusteringAlgorithms()
+        algorithms._model = Mock()
+
+        assert algorithms.get_embeddings([]).size == 0
+        algorithms._model.encode.assert_not_called()
+
+
+class TestCorpusKey:
+    def test_separator_in_text_does_not_collide(self):
+        key = ClusteringAlgorithms._corpus_key
+        assert key(["a\x1eb"]) != key(["a", "b"])
+        assert key(["ab", ""]) != key(["a", "b"])
+        assert key(["hola", "adios"]) == key(["hola", "adios"])
+
+
+class TestAgglomerativeConnectivity:
+    def test_small_inputs_use_exact_distances(self):
+        algorithms = ClusteringAlgorithms()
+        embeddings = np.random.rand(40, 4).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        with patch.object(ClusteringAlgorithms, "_knn_connectivity") as mock_knn:
+            labels, _ = algorithms._agglomerative_cluster(embeddings, 3)
+
+        mock_knn.assert_not_called()
+        assert len(set(labels)) == 3
+
+
+class TestBuildClusters:
+    def test_groups_texts_by_label_preserving_order(self):
+        algorithms = ClusteringAlgorithms()
+        texts = ["a", "b", "c", "d", "e"]
+        labels = np.array([1, -1, 0, 1, -1])
+
+        clusters = algorithms._build_clusters(texts, labels)
+
+        assert clusters == {
+            "noise": ["b", "e"],
+            "cluster_0": ["c"],
+            "cluster_1": ["a", "d"],
+        }
+
+
+class TestTopKCosine:
+    def test_returns_top_k_above_threshold_sorted(self):
+        from app.algorithms.clustering_algorithms import _topk_cosine
+
+        matrix = np.array(
+            [[1.0, 0.0], [0.0, 1.0], [0.6, 0.8], [0.8, 0.6]], dtype=np.float32
+        )
+        query = np.array([1.0, 0.0], dtype=np.float32)
+
+        indices, sims = _topk_cosine(query, matrix, 0.5, 3)
+
+        assert list(indices) == [0, 3, 2]
+        np.testing.assert_allclose(sims, [1.0, 0.8, 0.6], atol=1e-6)
+
+        indices, _ = _topk_cosine(query, matrix, 0.7, 3)
+        assert list(indices) == [0, 3]
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+import numpy as np
 from .schemas import (
     TextInput,
     AnalysisResponse,
@@ -20,11 +23,13 @@ settings = get_settings()
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint."""
+async def health_check(response: Response):
+    """Health check endpoint; 503 until the models are loaded."""
     status = nlp_service.get_status()
+    if not status["ready"]:
+        response.status_code = 503
     return HealthResponse(
-        status="healthy",
+        status="healthy" if status["ready"] else "starting",
         service=settings.app_name,
         version=settings.app_version,
         **status,
@@ -35,7 +40,7 @@ async def health_check():
 async def analyze_text(input_data: TextInput):
     """Perform full NLP analysis on text."""
     try:
-        result = nlp_service.analyze(input_data.text)
+        result = await nlp_service.analyze_async(input_data.text)
 
         return AnalysisResponse(
             text=result["text"],
@@ -55,7 +60,8 @@ async def analyze_text(input_data: TextInput):
 async def extract_entities(input_data: TextInput):
     """Extract entities from text."""
     try:
-        entities = nlp_service.extract_entities(input_data.text)
+        # Concurrent requests are run through spaCy together
+        entities = await nlp_service.extract_entities_async(input_data.text)
 
         return EntitiesResponse(
             text=input_data.text,
@@ -81,9 +87,12 @@ async def extract_entities(input_data: TextInput):
 async def classify_intent(input_data: TextInput):
     """Classify user intent."""
     try:
-        intent, confidence = nlp_service.classify_intent(input_data.text)
-        alternatives = nlp_service.intent_classifier.classify_with_alternatives(
-            input_data.text, top_k=3
+        # Both land in the same micro-batch, so the text is encoded once
+        (intent, confidence), alternatives = await asyncio.gather(
+            nlp_service.classify_intent_async(input_data.text),
+            nlp_service.intent_classifier.classify_with_alternatives_async(
+                input_data.text, top_k=3
+            ),
         )
 
         return IntentClassificationResponse(
@@ -100,11 +109,16 @@ async def classify_intent(input_data: TextInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/embedding", response_model=EmbeddingResponse)
+@router.post(
+    "/embedding",
+    response_class=ORJSONResponse,
+    responses={200: {"model": EmbeddingResponse}},
+)
 async def get_embedding(input_data: TextInput):
     """Get embedding vector for text."""
     try:
-        embedding = nlp_service.get_embedding(input_data.text)
+        # Encoded off the event loop, together with concurrent requests
+        embedding = await nlp_service.get_embedding_async(input_data.text)
 
         if embedding is None:
             raise HTTPException(
@@ -112,10 +126,51 @@ async def get_embedding(input_data: TextInput):
                 detail="Embedding model not available",
             )
 
-        return EmbeddingResponse(
-            text=input_data.text,
-            embedding=embedding,
-            dimensions=len(embedding),
+        embedding = np.asarray(embedding, dtype=np.float32)
+
+        # orjson serializes the float32 ndarray directly, skipping per-float
+        # Python conversion and response-model validation
+        return ORJSONResponse(
+            {
+                "text": input_data.text,
+                "embedding": embedding,
+                "dimensions": int(embedding.shape[0]),
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Embedding generation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/embedding/bin",
+    response_class=Response,
+    responses={200: {"content": {"application/octet-stream": {}}}},
+)
+async def get_embedding_binary(input_data: TextInput):
+    """
+    Get the embedding as raw little-endian float16 bytes.
+
+    A quarter of the JSON payload; X-Dim and X-Dtype headers describe the
+    vector (e.g. np.frombuffer(body, dtype="<f2")).
+    """
+    try:
+        embedding = await nlp_service.get_embedding_async(input_data.text)
+
+        if embedding is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Embedding model not available",
+            )
+
+        embedding = np.asarray(embedding, dtype="<f2")
+        return Response(
+            content=embedding.tobytes(),
+            media_type="application/octet-stream",
+            headers={"X-Dim": str(embedding.shape[0]), "X-Dtype": "float16"},
         )
 
     except HTTPException:
@@ -59,6 +59,7 @@ class HealthResponse(BaseModel):
     status: str
     service: str
     version: str
+    ready: bool
     spacy_model: str
     spacy_loaded: bool
     embedding_model: str
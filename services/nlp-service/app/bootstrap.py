@@ -0,0 +1,14 @@
+"""
+Process-level runtime setup for CPU inference.
+
+Imported by `app.main` before anything pulls in torch, since OpenMP/MKL
+read their thread counts once when the library is first loaded.
+"""
+import os
+from .config import get_settings
+
+_threads = str(get_settings().torch_threads or os.cpu_count() or 1)
+
+# Explicit environment settings win
+os.environ.setdefault("OMP_NUM_THREADS", _threads)
+os.environ.setdefault("MKL_NUM_THREADS", _threads)
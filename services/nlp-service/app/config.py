@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -7,12 +8,49 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = False
 
+    # Load and warm up spaCy and the embedding model at startup
+    preload_models: bool = True
+
     # spaCy model
     spacy_model: str = "es_core_news_md"
+    # Load only what NER needs; disable to keep tagger/parser/lemmatizer active
+    spacy_ner_only: bool = True
 
     # Sentence Transformers model (multilingual)
     embedding_model: str = "paraphrase-multilingual-MiniLM-L12-v2"
 
+    # Embedding backend: "torch" (sentence-transformers) or "onnx" (ONNX Runtime)
+    embedding_backend: str = "torch"
+    onnx_quantize: bool = True  # Dynamic INT8 quantization for the ONNX backend
+    onnx_cache_dir: Optional[str] = None  # Reuse exported ONNX models across restarts
+    onnx_max_seq_length: Optional[int] = None  # Defaults to the model's own limit
+
+    # PyTorch backend: fused attention via BetterTransformer, optional torch.compile
+    use_bettertransformer: bool = True
+    torch_compile: bool = False
+
+    # /entities micro-batching: concurrent requests share one spaCy pipe() call
+    entity_batch_wait_ms: float = 5.0
+    entity_batch_max_texts: int = 64
+
+    # Query embedding cache: in-process LRU entries, plus an optional Redis
+    # shared across workers (e.g. redis://localhost:6379/0)
+    intent_cache_size: int = 10000
+    redis_url: Optional[str] = None
+    redis_cache_ttl: int = 86400
+
+    # Intra-op CPU threads for torch/OpenMP/MKL (0 = all cores)
+    torch_threads: int = 0
+
+    # Score intents against int8-quantized example embeddings (opt-in; can
+    # reorder near-tied intents)
+    quantize_intent_embeddings: bool = False
+
+    # Intent micro-batching: wait up to this long (or until this many
+    # texts are queued) before encoding concurrent queries together
+    intent_batch_wait_ms: float = 5.0
+    intent_batch_max_texts: int = 32
+
     # Processing settings
     max_text_length: int = 10000
 
@@ -1,8 +1,13 @@
+from . import bootstrap  # noqa: F401  (must run before torch is imported)
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 from .config import get_settings
 from .api import router
+from .api.routes import nlp_service
 
 # Configure logging
 logging.basicConfig(
@@ -12,12 +17,23 @@ logging.basicConfig(
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm up the NLP models before serving requests."""
+    if settings.preload_models:
+        await asyncio.to_thread(nlp_service.warmup)
+    yield
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="NLP Service for Sorti365 - Entity extraction and intent classification",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -1,12 +1,56 @@
 import spacy
+from spacy.tokens import Doc
+import asyncio
 import re
 import logging
-from typing import Optional
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+from sorti365_shared import MicroBatcher, unicode_classes
 from ..models import EntityType, ExtractedEntity
 from ..config import get_settings
 
+try:
+    import hyperscan
+except ImportError:  # Fall back to RE2 sets, or no prefilter at all
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick
+except ImportError:  # Fall back to one substring search per keyword
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Prefilter id for the team (vs/contra) patterns
+_TEAM_GROUP = -1
+
+# Pipeline components whose output the extractor never reads (only doc.ents)
+UNUSED_SPACY_COMPONENTS = [
+    "tagger",
+    "morphologizer",
+    "parser",
+    "lemmatizer",
+    "attribute_ruler",
+    "senter",
+]
+
+
+@dataclass(slots=True)
+class _RawEnt:
+    """Unvalidated entity used inside the extractor; see ExtractedEntity."""
+    type: EntityType
+    value: str
+    confidence: float
+    start_pos: int
+    end_pos: int
+    normalized_value: Optional[str] = None
+
 
 class EntityExtractor:
     """Extract entities from text using spaCy and custom patterns."""
@@ -18,7 +62,10 @@ class EntityExtractor:
             self.nlp = nlp
         else:
             try:
-                self.nlp = spacy.load(self.settings.spacy_model)
+                self.nlp = spacy.load(
+                    self.settings.spacy_model,
+                    disable=UNUSED_SPACY_COMPONENTS if self.settings.spacy_ner_only else [],
+                )
                 logger.info(f"Loaded spaCy model: {self.settings.spacy_model}")
             except OSError:
                 logger.warning(f"Model {self.settings.spacy_model} not found. Using blank model.")
@@ -60,49 +107,278 @@ class EntityExtractor:
             r"([A-ZÁÉÍÓÚÑa-záéíóúñ\s]+)\s+(?:vs\.?|versus|contra)",
         ]
 
+        # Types whose every pattern requires a digit (skipped for digit-free text)
+        self.needs_digit = {
+            EntityType.TICKET_ID: True,
+            EntityType.DOCUMENT_NUMBER: False,  # "[\d\.-]+" also matches "-"
+            EntityType.MONEY: False,  # "[\d,]+" also matches ","
+            EntityType.PHONE: True,
+            EntityType.EMAIL: False,
+            EntityType.DATE: True,
+        }
+
+        self._compile_patterns()
+
+        # Concurrent async requests share one nlp.pipe pass for NER
+        self._ner_batcher = MicroBatcher(
+            self._ner_entities_batch,
+            max_wait_ms=self.settings.entity_batch_wait_ms,
+            max_batch=self.settings.entity_batch_max_texts,
+        )
+
+    def _compile_patterns(self):
+        """
+        Compile the regex patterns once.
+
+        Each entity type's patterns are fused into one alternation with a
+        named group per pattern, so every type is scanned in a single pass
+        and `lastgroup` identifies the pattern that matched. Types are kept
+        in separate scanners so overlapping matches across types (e.g. a
+        number that is both a phone and a document) are still reported.
+        """
+        self._type_scanners: list[tuple[EntityType, re.Pattern, dict[str, int]]] = []
+        for entity_type, patterns in self.patterns.items():
+            alternatives = []
+            value_groups = {}
+            group_index = 1
+            for i, pattern in enumerate(patterns):
+                name = f"{entity_type.name}_{i}"
+                alternatives.append(f"(?P<{name}>{pattern})")
+                # Value is the pattern's first capture group, else the whole match
+                n_groups = re.compile(pattern).groups
+                value_groups[name] = group_index + 1 if n_groups else group_index
+                group_index += 1 + n_groups
+            self._type_scanners.append(
+                (
+                    entity_type,
+                    re.compile("|".join(alternatives), re.IGNORECASE | re.MULTILINE),
+                    value_groups,
+                )
+            )
+
+        self._team_regexes = [re.compile(p, re.IGNORECASE) for p in self.team_patterns]
+        self._non_digit_re = re.compile(r"[^\d]")
+        self._digit_re = re.compile(r"\d")
+        self._phone_strip_re = re.compile(r"[^\d+]")
+
+        self._prefilter = self._build_prefilter()
+
+        # Single-pass multi-keyword matcher for sports
+        self._sports_automaton = None
+        if ahocorasick is not None:
+            self._sports_automaton = ahocorasick.Automaton()
+            for i, sport in enumerate(self.sports_keywords):
+                self._sports_automaton.add_word(sport, (i, sport))
+            self._sports_automaton.make_automaton()
+
+    def _build_prefilter(self) -> Optional[Callable[[str], set[int]]]:
+        """
+        Build a multi-pattern DFA that tells which pattern groups occur in a text.
+
+        Every pattern is tagged with its entity type's scanner index (or
+        `_TEAM_GROUP`) and compiled into a single Hyperscan database, falling
+        back to an RE2 set. Only the groups that hit are then run through the
+        `re` scanners, which still produce the capture groups and positions.
+        The patterns get `re`'s Unicode \\d and \\s classes, so the engines
+        never report fewer groups than `re` would match. Returns None when
+        neither engine is installed.
+        """
+        expressions: list[str] = []
+        ids: list[int] = []
+        for index, (entity_type, _, _) in enumerate(self._type_scanners):
+            for pattern in self.patterns[entity_type]:
+                expressions.append(unicode_classes(pattern))
+                ids.append(index)
+        for pattern in self.team_patterns:
+            expressions.append(unicode_classes(pattern))
+            ids.append(_TEAM_GROUP)
+
+        try:
+            if hyperscan is not None:
+                return self._build_hyperscan_prefilter(expressions, ids)
+            if re2 is not None:
+                return self._build_re2_prefilter(expressions, ids)
+        except Exception as e:
+            logger.warning(f"Regex prefilter unavailable, scanning all patterns: {str(e)}")
+        return None
+
+    @staticmethod
+    def _build_hyperscan_prefilter(
+        expressions: list[str], ids: list[int]
+    ) -> Callable[[str], set[int]]:
+        """Compile the patterns into a Hyperscan block-mode database."""
+        flags = (
+            hyperscan.HS_FLAG_CASELESS
+            | hyperscan.HS_FLAG_MULTILINE
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP
+            | hyperscan.HS_FLAG_SINGLEMATCH
+        )
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[e.encode("utf-8") for e in expressions],
+            ids=list(range(len(expressions))),
+            flags=[flags] * len(expressions),
+        )
+        # Scratch space must not be shared between concurrent scans
+        local = threading.local()
+
+        def scan(text: str) -> set[int]:
+            scratch = getattr(local, "scratch", None)
+            if scratch is None:
+                scratch = local.scratch = hyperscan.Scratch(database)
+            hits: set[int] = set()
+
+            def on_match(expression_id, start, end, flags, context):
+                hits.add(ids[expression_id])
+
+            database.scan(text.encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+            return hits
+
+        return scan
+
+    @staticmethod
+    def _build_re2_prefilter(
+        expressions: list[str], ids: list[int]
+    ) -> Callable[[str], set[int]]:
+        """Compile the patterns into an RE2 set (used where Hyperscan is unavailable)."""
+        pattern_set = re2.Set.SearchSet(re2.Options())
+        for expression in expressions:
+            pattern_set.Add(f"(?im){expression}")
+        pattern_set.Compile()
+
+        def scan(text: str) -> set[int]:
+            return {ids[i] for i in pattern_set.Match(text.encode("utf-8")) or ()}
+
+        return scan
+
     def extract_entities(self, text: str) -> list[ExtractedEntity]:
         """Extract all entities from text."""
+        # Nothing shorter can match a pattern or keyword (the shortest is "$5")
+        if len(text) < 2:
+            return []
+
+        ner = self._entities_from_doc(self.nlp(text)) if self._needs_ner(text) else []
+        return self._extract_all(text, ner)
+
+    async def extract_entities_async(self, text: str) -> list[ExtractedEntity]:
+        """
+        Extract all entities from text without blocking the event loop.
+
+        The prefilter, pattern and sports scanning run on a worker thread
+        while NER waits for the next micro-batch; the regex and spaCy
+        scanners spend most of their time in C code, so the stages overlap.
+        """
+        if len(text) < 2:
+            return []
+
+        regex, ner = await asyncio.gather(
+            asyncio.to_thread(self._extract_with_regexes, text),
+            self._ner_batcher.submit([text]),
+        )
+        return self._finalize(regex + ner[0])
+
+    def _ner_entities_batch(self, texts: list[str]) -> list[list[_RawEnt]]:
+        """spaCy entities for each text, piping only texts that need NER."""
+        results: list[list[_RawEnt]] = [[] for _ in texts]
+        indices = [
+            i for i, text in enumerate(texts) if len(text) >= 2 and self._needs_ner(text)
+        ]
+
+        # Only NER output is read; skip any other components in the pipeline
+        docs = self.nlp.pipe(
+            (texts[i] for i in indices),
+            batch_size=64,
+            disable=UNUSED_SPACY_COMPONENTS,
+        )
+        for i, doc in zip(indices, docs):
+            results[i] = self._entities_from_doc(doc)
+        return results
+
+    def _needs_ner(self, text: str) -> bool:
+        """
+        Cheap check for whether spaCy NER can add anything.
+
+        Short texts with no digits and at most one capital letter (greetings,
+        "gracias", ...) carry no names, dates or amounts worth a model pass.
+        """
+        if len(text) >= 15 or self._digit_re.search(text):
+            return True
+        return sum(1 for c in text if c.isupper()) > 1
+
+    def _extract_with_regexes(self, text: str) -> list[_RawEnt]:
+        """Pattern and sports entities, sharing one prefilter scan."""
+        groups = self._prefilter_groups(text)
+        return self._extract_with_patterns(text, groups) + self._extract_sports_entities(
+            text, groups
+        )
+
+    def _prefilter_groups(self, text: str) -> Optional[set[int]]:
+        """Pattern groups the prefilter found in `text`; None means scan them all."""
+        if not self._prefilter:
+            return None
+        try:
+            return self._prefilter(text)
+        except UnicodeEncodeError:
+            # Lone surrogates are not valid UTF-8, which both engines require
+            return None
+
+    def _extract_all(self, text: str, ner: list[_RawEnt]) -> list[ExtractedEntity]:
+        """Combine pattern, spaCy (already extracted) and sports entities for one text."""
         entities = []
+        groups = self._prefilter_groups(text)
 
         # Extract using custom patterns
-        entities.extend(self._extract_with_patterns(text))
+        entities.extend(self._extract_with_patterns(text, groups))
 
-        # Extract using spaCy NER
-        entities.extend(self._extract_with_spacy(text))
+        # spaCy NER
+        entities.extend(ner)
 
         # Extract sports/teams
-        entities.extend(self._extract_sports_entities(text))
+        entities.extend(self._extract_sports_entities(text, groups))
 
-        # Deduplicate entities
-        entities = self._deduplicate_entities(entities)
+        return self._finalize(entities)
 
-        return entities
+    def _finalize(self, entities: list[_RawEnt]) -> list[ExtractedEntity]:
+        """Deduplicate, then build the API models."""
+        # The fields are already well-typed, so skip pydantic validation
+        return [
+            ExtractedEntity.model_construct(**asdict(raw))
+            for raw in self._deduplicate_entities(entities)
+        ]
 
-    def _extract_with_patterns(self, text: str) -> list[ExtractedEntity]:
-        """Extract entities using regex patterns."""
+    def _extract_with_patterns(
+        self, text: str, groups: Optional[set[int]] = None
+    ) -> list[_RawEnt]:
+        """Extract entities using regex patterns, limited to prefiltered groups."""
         entities = []
+        if groups is None:
+            groups = self._prefilter_groups(text)
+        has_digit = self._digit_re.search(text) is not None
 
-        for entity_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-                    value = match.group(1) if match.groups() else match.group(0)
-                    entities.append(
-                        ExtractedEntity(
-                            type=entity_type,
-                            value=value,
-                            confidence=0.85,
-                            start_pos=match.start(),
-                            end_pos=match.end(),
-                            normalized_value=self._normalize_value(entity_type, value),
-                        )
+        for index, (entity_type, scanner, value_groups) in enumerate(self._type_scanners):
+            if groups is not None and index not in groups:
+                continue
+            if not has_digit and self.needs_digit[entity_type]:
+                continue
+            for match in scanner.finditer(text):
+                value = match.group(value_groups[match.lastgroup])
+                entities.append(
+                    _RawEnt(
+                        type=entity_type,
+                        value=value,
+                        confidence=0.85,
+                        start_pos=match.start(),
+                        end_pos=match.end(),
+                        normalized_value=self._normalize_value(entity_type, value),
                     )
+                )
 
         return entities
 
-    def _extract_with_spacy(self, text: str) -> list[ExtractedEntity]:
-        """Extract entities using spaCy NER."""
+    def _entities_from_doc(self, doc: Doc) -> list[_RawEnt]:
+        """Extract entities from a spaCy doc's NER output."""
         entities = []
-        doc = self.nlp(text)
 
         # Map spaCy labels to our entity types
         label_mapping = {
@@ -119,7 +395,7 @@ class EntityExtractor:
             entity_type = label_mapping.get(ent.label_, EntityType.UNKNOWN)
             if entity_type != EntityType.UNKNOWN:
                 entities.append(
-                    ExtractedEntity(
+                    _RawEnt(
                         type=entity_type,
                         value=ent.text,
                         confidence=0.75,
@@ -130,32 +406,35 @@ class EntityExtractor:
 
         return entities
 
-    def _extract_sports_entities(self, text: str) -> list[ExtractedEntity]:
+    def _extract_sports_entities(
+        self, text: str, groups: Optional[set[int]] = None
+    ) -> list[_RawEnt]:
         """Extract sports and team entities."""
         entities = []
-        text_lower = text.lower()
+        if groups is None:
+            groups = self._prefilter_groups(text)
 
         # Check for sports
-        for sport in self.sports_keywords:
-            if sport in text_lower:
-                idx = text_lower.index(sport)
-                entities.append(
-                    ExtractedEntity(
-                        type=EntityType.SPORT,
-                        value=sport,
-                        confidence=0.9,
-                        start_pos=idx,
-                        end_pos=idx + len(sport),
-                    )
+        for sport, idx in self._find_sports(text.lower()):
+            entities.append(
+                _RawEnt(
+                    type=EntityType.SPORT,
+                    value=sport,
+                    confidence=0.9,
+                    start_pos=idx,
+                    end_pos=idx + len(sport),
                 )
+            )
 
         # Check for teams (vs patterns)
-        for pattern in self.team_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        if groups is not None and _TEAM_GROUP not in groups:
+            return entities
+        for regex in self._team_regexes:
+            for match in regex.finditer(text):
                 team = match.group(1).strip()
                 if len(team) > 2:  # Filter out very short matches
                     entities.append(
-                        ExtractedEntity(
+                        _RawEnt(
                             type=EntityType.TEAM,
                             value=team,
                             confidence=0.7,
@@ -166,25 +445,43 @@ class EntityExtractor:
 
         return entities
 
+    def _find_sports(self, text_lower: str) -> list[tuple[str, int]]:
+        """First occurrence of each sports keyword, in keyword order."""
+        if self._sports_automaton is None:
+            found = []
+            for sport in self.sports_keywords:
+                idx = text_lower.find(sport)
+                if idx >= 0:
+                    found.append((sport, idx))
+            return found
+
+        # One Aho-Corasick pass; matches arrive by end position, so the
+        # first hit per keyword is its leftmost occurrence
+        first: dict[int, int] = {}
+        for end, (i, sport) in self._sports_automaton.iter(text_lower):
+            first.setdefault(i, end - len(sport) + 1)
+        return [(self.sports_keywords[i], first[i]) for i in sorted(first)]
+
     def _normalize_value(self, entity_type: EntityType, value: str) -> str:
         """Normalize extracted value based on entity type."""
         if entity_type == EntityType.DOCUMENT_NUMBER:
-            return re.sub(r"[^\d]", "", value)
+            return self._non_digit_re.sub("", value)
         elif entity_type == EntityType.TICKET_ID:
-            return re.sub(r"[^\d]", "", value)
+            return self._non_digit_re.sub("", value)
         elif entity_type == EntityType.MONEY:
             return value.replace(",", "").strip()
         elif entity_type == EntityType.PHONE:
-            return re.sub(r"[^\d+]", "", value)
+            return self._phone_strip_re.sub("", value)
         return value
 
     def _deduplicate_entities(
-        self, entities: list[ExtractedEntity]
-    ) -> list[ExtractedEntity]:
+        self, entities: list[_RawEnt]
+    ) -> list[_RawEnt]:
         """Remove duplicate entities, keeping highest confidence."""
-        seen = {}
+        best = {}
         for entity in entities:
-            key = (entity.type, entity.value)
-            if key not in seen or entity.confidence > seen[key].confidence:
-                seen[key] = entity
-        return list(seen.values())
+            key = (entity.type.value, entity.value)
+            current = best.get(key)
+            if current is None or entity.confidence > current.confidence:
+                best[key] = entity
+        return list(best.values())
@@ -1,13 +1,57 @@
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import torch
+import xxhash
+from sorti365_shared import EmbeddingBatcher, OnnxEncoder
 from ..models import IntentType
 from ..config import get_settings
 
+try:
+    import numba
+except ImportError:  # Fall back to NumPy when Numba is not installed
+    numba = None
+
+try:
+    import redis
+except ImportError:  # Shared cache is optional; the in-process LRU always works
+    redis = None
+
 logger = logging.getLogger(__name__)
 
 
+def _quantize_int8(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization; returns (values, per-row scales)."""
+    max_abs = np.abs(matrix).max(axis=-1, keepdims=True)
+    max_abs[max_abs == 0] = 1.0
+    values = np.rint(matrix * (127 / max_abs)).astype(np.int8)
+    return values, (max_abs / 127).astype(np.float32).reshape(matrix.shape[:-1])
+
+
+if numba is not None:
+
+    @numba.njit(fastmath=True, cache=True)
+    def _int8_dot_rows(matrix, query):
+        """int8 row-by-query dot products accumulated in int32 (VNNI-friendly)."""
+        n, d = matrix.shape
+        out = np.empty(n, dtype=np.int32)
+        for i in range(n):
+            acc = np.int32(0)
+            for j in range(d):
+                acc += np.int32(matrix[i, j]) * np.int32(query[j])
+            out[i] = acc
+        return out
+
+else:
+
+    def _int8_dot_rows(matrix, query):
+        """int8 row-by-query dot products accumulated in int32."""
+        return matrix.astype(np.int32) @ query.astype(np.int32)
+
+
 class IntentClassifier:
     """Classify user intent using semantic similarity with Sentence-BERT."""
 
@@ -18,8 +62,7 @@ class IntentClassifier:
             self.model = model
         else:
             try:
-                self.model = SentenceTransformer(self.settings.embedding_model)
-                logger.info(f"Loaded embedding model: {self.settings.embedding_model}")
+                self.model = self.load_embedding_model()
             except Exception as e:
                 logger.error(f"Failed to load embedding model: {str(e)}")
                 self.model = None
@@ -111,41 +154,241 @@ class IntentClassifier:
 
         # Pre-compute embeddings for intent examples
         self.intent_embeddings = {}
+        self._intent_order: list[IntentType] = []
+        self._all_emb = np.empty((0, 0), dtype=np.float32)
+        self._offsets = np.zeros(1, dtype=np.intp)
+        self._all_emb_i8: Optional[np.ndarray] = None
+        self._row_scales: Optional[np.ndarray] = None
+
+        # Query embeddings are cached per text (in-process LRU, optional Redis)
+        self._embedding_cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._redis = self._connect_redis()
+
         if self.model:
             self._precompute_embeddings()
 
+        # Concurrent async queries are encoded together in one model call
+        self._batcher = EmbeddingBatcher(
+            self._encode_batch,
+            max_wait_ms=self.settings.intent_batch_wait_ms,
+            max_batch=self.settings.intent_batch_max_texts,
+        )
+
+    @staticmethod
+    def load_embedding_model():
+        """Load the sentence encoder for the configured backend."""
+        settings = get_settings()
+        if settings.embedding_backend == "onnx":
+            model = OnnxEncoder(
+                settings.embedding_model,
+                quantize=settings.onnx_quantize,
+                max_seq_length=settings.onnx_max_seq_length,
+                cache_dir=settings.onnx_cache_dir,
+            )
+        else:
+            model = SentenceTransformer(settings.embedding_model)
+            IntentClassifier._optimize_torch_model(model)
+        logger.info(
+            f"Loaded embedding model: {settings.embedding_model} ({settings.embedding_backend})"
+        )
+
+        # Trigger lazy init / compilation off the request path
+        model.encode(["warmup"])
+        return model
+
+    @staticmethod
+    def _optimize_torch_model(model: SentenceTransformer) -> None:
+        """Swap in fused attention kernels and optionally compile the transformer."""
+        settings = get_settings()
+        transformer = model._first_module()
+
+        if settings.use_bettertransformer:
+            try:
+                from optimum.bettertransformer import BetterTransformer
+
+                transformer.auto_model = BetterTransformer.transform(
+                    transformer.auto_model, keep_original_model=False
+                )
+                logger.info("Enabled BetterTransformer fused attention")
+            except Exception as e:
+                # Unsupported architectures (or native SDPA models) keep eager attention
+                logger.warning(f"BetterTransformer unavailable: {str(e)}")
+
+        if settings.torch_compile:
+            try:
+                transformer.auto_model = torch.compile(
+                    transformer.auto_model, mode="reduce-overhead"
+                )
+                logger.info("Compiled embedding model with torch.compile")
+            except Exception as e:
+                logger.warning(f"torch.compile unavailable: {str(e)}")
+
     def _precompute_embeddings(self):
-        """Pre-compute embeddings for all intent examples."""
+        """
+        Pre-compute embeddings for all intent examples.
+
+        All examples are stacked into one L2-normalized float32 matrix, with
+        `_offsets` marking where each intent's rows start, so a query is
+        scored against every intent with a single matrix-vector product.
+        Unless disabled in settings, the matrix is also kept as per-row int8
+        (a quarter of the size) and scored with int32 accumulation.
+        """
         for intent, examples in self.intent_examples.items():
             embeddings = self.model.encode(examples)
             self.intent_embeddings[intent] = embeddings
             logger.debug(f"Computed embeddings for intent: {intent}")
 
-    def classify(self, text: str) -> tuple[IntentType, float]:
+        self._intent_order = list(self.intent_embeddings)
+        all_emb = np.vstack(
+            [self.intent_embeddings[intent] for intent in self._intent_order]
+        ).astype(np.float32)
+        all_emb /= np.linalg.norm(all_emb, axis=1, keepdims=True)
+        self._all_emb = all_emb
+        self._offsets = np.cumsum(
+            [0] + [len(self.intent_embeddings[intent]) for intent in self._intent_order]
+        )
+
+        if self.settings.quantize_intent_embeddings:
+            self._all_emb_i8, self._row_scales = _quantize_int8(all_emb)
+
+        # Cached query vectors belong to the previous model
+        with self._cache_lock:
+            self._embedding_cache.clear()
+
+    def _connect_redis(self):
+        """Connect to the shared embedding cache, if one is configured."""
+        if not self.settings.redis_url:
+            return None
+        if redis is None:
+            logger.warning("NLP_REDIS_URL is set but the redis package is not installed")
+            return None
+        try:
+            client = redis.Redis.from_url(self.settings.redis_url, socket_timeout=0.1)
+            client.ping()
+            logger.info("Connected to Redis embedding cache")
+            return client
+        except Exception as e:
+            logger.warning(f"Redis embedding cache unavailable: {str(e)}")
+            return None
+
+    def _cache_key(self, text: str) -> int:
+        """Hash of the exact text (the encoder is case- and accent-sensitive)."""
+        return xxhash.xxh3_64_intdigest(text.encode("utf-8"))
+
+    def _redis_key(self, key: int) -> str:
         """
-        Classify the intent of the input text.
+        Redis key, namespaced by everything that shapes the vector (model,
+        backend, quantization, truncation) so a config change never hits
+        stale vectors.
+        """
+        quantized = self.settings.embedding_backend == "onnx" and self.settings.onnx_quantize
+        max_seq_length = getattr(self.model, "max_seq_length", None)
+        return (
+            f"nlp:emb:{self.settings.embedding_backend}:"
+            f"{self.settings.embedding_model}:q{int(quantized)}:"
+            f"len{max_seq_length}:{key:016x}"
+        )
 
-        Returns:
-            Tuple of (IntentType, confidence_score)
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
         """
-        if not self.model:
-            return IntentType.UNKNOWN, 0.0
+        Encode a batch of queries, one row per text.
 
-        # Get embedding for input text
-        text_embedding = self.model.encode([text])[0]
+        Cached vectors are served from the LRU, then Redis; the remaining
+        texts go through the model in a single call and are cached.
+        """
+        keys = [self._cache_key(text) for text in texts]
+        vectors = [self._cache_get(key) for key in keys]
 
-        best_intent = IntentType.UNKNOWN
-        best_score = 0.0
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing and self._redis is not None:
+            try:
+                stored = self._redis.mget([self._redis_key(keys[i]) for i in missing])
+            except Exception as e:
+                logger.warning(f"Redis lookup failed: {str(e)}")
+                stored = [None] * len(missing)
+            for i, value in zip(missing, stored):
+                if value is not None:
+                    vectors[i] = np.frombuffer(value, dtype=np.float32)
+                    self._cache_put(keys[i], vectors[i])
+            missing = [i for i in missing if vectors[i] is None]
 
-        # Compare with each intent's examples
-        for intent, embeddings in self.intent_embeddings.items():
-            # Calculate cosine similarity with all examples
-            similarities = self._cosine_similarity(text_embedding, embeddings)
-            max_similarity = float(np.max(similarities))
+        if missing:
+            encoded = np.asarray(
+                self.model.encode(
+                    [texts[i] for i in missing],
+                    batch_size=self.settings.intent_batch_max_texts,
+                ),
+                dtype=np.float32,
+            )
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+                self._cache_put(keys[i], vector)
+            if self._redis is not None:
+                try:
+                    with self._redis.pipeline(transaction=False) as pipe:
+                        for i, vector in zip(missing, encoded):
+                            pipe.set(
+                                self._redis_key(keys[i]),
+                                vector.tobytes(),
+                                ex=self.settings.redis_cache_ttl,
+                            )
+                        pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Redis store failed: {str(e)}")
 
-            if max_similarity > best_score:
-                best_score = max_similarity
-                best_intent = intent
+        return np.stack(vectors)
+
+    async def _encode_async(self, text: str) -> np.ndarray:
+        """Embed one query, going through the micro-batcher only on a cache miss."""
+        vector = self._cache_get(self._cache_key(text))
+        if vector is None:
+            vector = (await self._batcher.encode([text]))[0]
+        return vector
+
+    def _cache_get(self, key: int) -> Optional[np.ndarray]:
+        """Look up a cached embedding, marking it as recently used."""
+        with self._cache_lock:
+            vector = self._embedding_cache.get(key)
+            if vector is not None:
+                self._embedding_cache.move_to_end(key)
+            return vector
+
+    def _cache_put(self, key: int, vector: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entries."""
+        if self.settings.intent_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._embedding_cache[key] = vector
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self.settings.intent_cache_size:
+                self._embedding_cache.popitem(last=False)
+
+    def _intent_scores(self, text_embedding: np.ndarray) -> np.ndarray:
+        """Max cosine similarity of an embedding against each intent, in `_intent_order`."""
+        text_embedding = np.asarray(text_embedding, dtype=np.float32)
+        query = text_embedding / np.linalg.norm(text_embedding)
+
+        if self._all_emb_i8 is not None:
+            query_i8, query_scale = _quantize_int8(query)
+            similarities = (
+                _int8_dot_rows(self._all_emb_i8, query_i8) * self._row_scales * query_scale
+            )
+            # Rounding can push exact matches slightly above 1
+            np.minimum(similarities, 1.0, out=similarities)
+        else:
+            similarities = self._all_emb @ query
+        return np.maximum.reduceat(similarities, self._offsets[:-1])
+
+    def _best_intent(self, scores: np.ndarray) -> tuple[IntentType, float]:
+        """Pick the best-scoring intent, applying the confidence threshold."""
+        best = int(np.argmax(scores))
+
+        best_intent = IntentType.UNKNOWN
+        best_score = 0.0
+        if scores[best] > best_score:
+            best_score = float(scores[best])
+            best_intent = self._intent_order[best]
 
         # Apply threshold
         if best_score < 0.5:
@@ -153,6 +396,40 @@ class IntentClassifier:
 
         return best_intent, best_score
 
+    def _ranked_intents(
+        self, scores: np.ndarray, top_k: int
+    ) -> list[tuple[IntentType, float]]:
+        """Top-k intents by score."""
+        # Sort by score descending (stable, so ties keep intent order)
+        ranked = np.argsort(-scores, kind="stable")[:top_k]
+
+        return [(self._intent_order[i], float(scores[i])) for i in ranked]
+
+    def classify(self, text: str) -> tuple[IntentType, float]:
+        """
+        Classify the intent of the input text.
+
+        Returns:
+            Tuple of (IntentType, confidence_score)
+        """
+        if not self.model:
+            return IntentType.UNKNOWN, 0.0
+
+        return self._best_intent(self._intent_scores(self._encode_batch([text])[0]))
+
+    async def classify_async(self, text: str) -> tuple[IntentType, float]:
+        """
+        Classify intent, batching the encode with concurrent requests.
+
+        Returns:
+            Tuple of (IntentType, confidence_score)
+        """
+        if not self.model:
+            return IntentType.UNKNOWN, 0.0
+
+        embedding = await self._encode_async(text)
+        return self._best_intent(self._intent_scores(embedding))
+
     def classify_with_alternatives(
         self, text: str, top_k: int = 3
     ) -> list[tuple[IntentType, float]]:
@@ -165,35 +442,33 @@ class IntentClassifier:
         if not self.model:
             return [(IntentType.UNKNOWN, 0.0)]
 
-        text_embedding = self.model.encode([text])[0]
-
-        scores = []
-        for intent, embeddings in self.intent_embeddings.items():
-            similarities = self._cosine_similarity(text_embedding, embeddings)
-            max_similarity = float(np.max(similarities))
-            scores.append((intent, max_similarity))
-
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
+        return self._ranked_intents(
+            self._intent_scores(self._encode_batch([text])[0]), top_k
+        )
 
-        return scores[:top_k]
+    async def classify_with_alternatives_async(
+        self, text: str, top_k: int = 3
+    ) -> list[tuple[IntentType, float]]:
+        """
+        Return top-k intents, batching the encode with concurrent requests.
 
-    def _cosine_similarity(
-        self, vec1: np.ndarray, vec2: np.ndarray
-    ) -> np.ndarray:
-        """Calculate cosine similarity between vec1 and all vectors in vec2."""
-        # Normalize vectors
-        vec1_norm = vec1 / np.linalg.norm(vec1)
+        Returns:
+            List of (IntentType, confidence_score) tuples
+        """
+        if not self.model:
+            return [(IntentType.UNKNOWN, 0.0)]
 
-        if len(vec2.shape) == 1:
-            vec2_norm = vec2 / np.linalg.norm(vec2)
-        else:
-            vec2_norm = vec2 / np.linalg.norm(vec2, axis=1, keepdims=True)
+        embedding = await self._encode_async(text)
+        return self._ranked_intents(self._intent_scores(embedding), top_k)
 
-        return np.dot(vec2_norm, vec1_norm)
+    def get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Get embedding vector for text (float32)."""
+        if not self.model:
+            return None
+        return self._encode_batch([text])[0]
 
-    def get_embedding(self, text: str) -> Optional[list[float]]:
-        """Get embedding vector for text."""
+    async def get_embedding_async(self, text: str) -> Optional[np.ndarray]:
+        """Get embedding vector for text (float32), batched with concurrent requests."""
         if not self.model:
             return None
-        return self.model.encode([text])[0].tolist()
+        return await self._encode_async(text)
@@ -1,8 +1,11 @@
+import asyncio
+import os
+import numpy as np
 import spacy
+import torch
 import logging
 from typing import Optional
-from sentence_transformers import SentenceTransformer
-from .entity_extractor import EntityExtractor
+from .entity_extractor import EntityExtractor, UNUSED_SPACY_COMPONENTS
 from .intent_classifier import IntentClassifier
 from ..models import IntentType, ExtractedEntity
 from ..config import get_settings
@@ -19,13 +22,28 @@ class NLPService:
         self._model = None
         self._entity_extractor = None
         self._intent_classifier = None
+        # Not ready until warmup() has loaded the models (unless preloading is off)
+        self.ready = not self.settings.preload_models
+        self._configure_torch()
+
+    def _configure_torch(self) -> None:
+        """Size torch's CPU thread pools."""
+        torch.set_num_threads(self.settings.torch_threads or os.cpu_count() or 1)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only settable once, before any inter-op work has started
+            pass
 
     @property
     def nlp(self):
         """Lazy load spaCy model."""
         if self._nlp is None:
             try:
-                self._nlp = spacy.load(self.settings.spacy_model)
+                self._nlp = spacy.load(
+                    self.settings.spacy_model,
+                    disable=UNUSED_SPACY_COMPONENTS if self.settings.spacy_ner_only else [],
+                )
                 logger.info(f"Loaded spaCy model: {self.settings.spacy_model}")
             except OSError:
                 logger.warning(
@@ -40,8 +58,7 @@ class NLPService:
         """Lazy load sentence transformer model."""
         if self._model is None:
             try:
-                self._model = SentenceTransformer(self.settings.embedding_model)
-                logger.info(f"Loaded embedding model: {self.settings.embedding_model}")
+                self._model = IntentClassifier.load_embedding_model()
             except Exception as e:
                 logger.error(f"Failed to load embedding model: {str(e)}")
                 self._model = None
@@ -81,6 +98,31 @@ class NLPService:
         # Get alternative intents
         alternatives = self.intent_classifier.classify_with_alternatives(text, top_k=3)
 
+        return self._analysis_result(text, entities, intent, intent_confidence, alternatives)
+
+    async def analyze_async(self, text: str) -> dict:
+        """Perform full NLP analysis, overlapping the entity and intent stages."""
+        if len(text) > self.settings.max_text_length:
+            text = text[: self.settings.max_text_length]
+
+        # Both intent calls land in the same micro-batch, so the text is encoded once
+        entities, (intent, intent_confidence), alternatives = await asyncio.gather(
+            self.entity_extractor.extract_entities_async(text),
+            self.intent_classifier.classify_async(text),
+            self.intent_classifier.classify_with_alternatives_async(text, top_k=3),
+        )
+
+        return self._analysis_result(text, entities, intent, intent_confidence, alternatives)
+
+    @staticmethod
+    def _analysis_result(
+        text: str,
+        entities: list[ExtractedEntity],
+        intent: IntentType,
+        intent_confidence: float,
+        alternatives: list[tuple[IntentType, float]],
+    ) -> dict:
+        """Assemble the analysis response dictionary."""
         return {
             "text": text,
             "entities": [e.model_dump() for e in entities],
@@ -101,21 +143,49 @@ class NLPService:
             text = text[: self.settings.max_text_length]
         return self.entity_extractor.extract_entities(text)
 
+    async def extract_entities_async(self, text: str) -> list[ExtractedEntity]:
+        """Extract entities from text, overlapping the extractor stages."""
+        if len(text) > self.settings.max_text_length:
+            text = text[: self.settings.max_text_length]
+        return await self.entity_extractor.extract_entities_async(text)
+
     def classify_intent(self, text: str) -> tuple[IntentType, float]:
         """Classify user intent."""
         if len(text) > self.settings.max_text_length:
             text = text[: self.settings.max_text_length]
         return self.intent_classifier.classify(text)
 
-    def get_embedding(self, text: str) -> Optional[list[float]]:
-        """Get embedding vector for text."""
+    async def classify_intent_async(self, text: str) -> tuple[IntentType, float]:
+        """Classify user intent, micro-batched with concurrent requests."""
+        if len(text) > self.settings.max_text_length:
+            text = text[: self.settings.max_text_length]
+        return await self.intent_classifier.classify_async(text)
+
+    def get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Get embedding vector for text (float32)."""
         if len(text) > self.settings.max_text_length:
             text = text[: self.settings.max_text_length]
         return self.intent_classifier.get_embedding(text)
 
+    async def get_embedding_async(self, text: str) -> Optional[np.ndarray]:
+        """Get embedding vector for text (float32), micro-batched with concurrent requests."""
+        if len(text) > self.settings.max_text_length:
+            text = text[: self.settings.max_text_length]
+        return await self.intent_classifier.get_embedding_async(text)
+
+    def warmup(self) -> None:
+        """Load both models and run one analysis so first requests are fast."""
+        _ = self.entity_extractor
+        _ = self.intent_classifier
+        # Exercises spaCy, the encoder, the regex scanners and the JIT kernels
+        self.analyze("hola mundo")
+        self.ready = True
+        logger.info("NLP models loaded and warmed up")
+
     def get_status(self) -> dict:
         """Get service status."""
         return {
+            "ready": self.ready,
             "spacy_model": self.settings.spacy_model,
             "spacy_loaded": self._nlp is not None,
             "embedding_model": self.settings.embedding_model,
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -11,11 +11,21 @@ client = TestClient(app)
 
 class TestHealthEndpoint:
     def test_health_check(self):
-        response = client.get("/health")
+        # Entering the client runs the lifespan, which warms up the models
+        with TestClient(app) as warm_client:
+            response = warm_client.get("/api/nlp/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
-        assert data["service"] == "nlp-service"
+        assert data["service"] == "NLP Service"
+
+    def test_health_check_while_starting(self):
+        from app.api.routes import nlp_service
+
+        with patch.object(nlp_service, "ready", False):
+            response = client.get("/api/nlp/health")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
 
 
 class TestAnalyzeEndpoint:
@@ -23,7 +33,7 @@ class TestAnalyzeEndpoint:
         response = client.post("/api/nlp/analyze", json={})
         assert response.status_code == 422
 
-    @patch("app.services.nlp_service.NLPService.analyze")
+    @patch("app.services.nlp_service.NLPService.analyze_async")
     def test_analyze_text_success(self, mock_analyze):
         mock_analyze.return_value = {
             "intent": {
@@ -52,6 +62,27 @@ class TestAnalyzeEndpoint:
             assert "intent" in data or "error" in data
 
 
+class TestAnalyzeAsync:
+    async def test_matches_sync_analysis(self):
+        import spacy
+        from app.services.nlp_service import NLPService
+        from app.services.entity_extractor import EntityExtractor
+
+        intent = (IntentType.TICKET_VERIFICATION, 0.9123)
+        alternatives = [intent, (IntentType.GREETING, 0.4)]
+        service = NLPService()
+        service._entity_extractor = EntityExtractor(spacy.blank("es"))
+        service._intent_classifier = Mock(
+            classify=Mock(return_value=intent),
+            classify_async=AsyncMock(return_value=intent),
+            classify_with_alternatives=Mock(return_value=alternatives),
+            classify_with_alternatives_async=AsyncMock(return_value=alternatives),
+        )
+
+        text = "Quiero verificar mi ticket TKT-123456 del 12/05/2024"
+        assert await service.analyze_async(text) == service.analyze(text)
+
+
 class TestEntitiesEndpoint:
     @patch("app.services.entity_extractor.EntityExtractor.extract")
     def test_extract_entities_success(self, mock_extract):
@@ -123,7 +154,7 @@ class TestIntentEndpoint:
 
 
 class TestEmbeddingEndpoint:
-    @patch("app.services.nlp_service.NLPService.get_embedding")
+    @patch("app.services.nlp_service.NLPService.get_embedding_async")
     def test_get_embedding_success(self, mock_embed):
         mock_embed.return_value = {
             "embedding": [0.1, 0.2, 0.3, 0.4] * 96,  # 384 dimensions
@@ -140,6 +171,29 @@ class TestEmbeddingEndpoint:
             if "embedding" in data:
                 assert isinstance(data["embedding"], list)
 
+    def test_openapi_documents_embedding_response(self):
+        operation = client.get("/openapi.json").json()["paths"]["/api/nlp/embedding"]["post"]
+        schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["$ref"].endswith("/EmbeddingResponse")
+
+    @patch("app.services.nlp_service.NLPService.get_embedding_async")
+    def test_get_embedding_binary(self, mock_embed):
+        import numpy as np
+
+        vector = np.linspace(-1, 1, 384, dtype=np.float32)
+        mock_embed.return_value = vector
+
+        response = client.post("/api/nlp/embedding/bin", json={
+            "text": "Texto de prueba para embedding"
+        })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["x-dim"] == "384"
+        assert response.headers["x-dtype"] == "float16"
+        decoded = np.frombuffer(response.content, dtype="<f2")
+        np.testing.assert_allclose(decoded, vector, atol=1e-3)
+
 
 class TestEntityTypes:
     def test_entity_type_values(self):
@@ -175,3 +229,173 @@ class TestErrorHandling:
 
         # Should handle gracefully (either process or return error)
         assert response.status_code in [200, 400, 413, 500]
+
+
+class TestIntentClassifier:
+    @pytest.fixture
+    def classifier(self):
+        import numpy as np
+        from app.services.intent_classifier import IntentClassifier
+
+        with patch.object(IntentClassifier, "_precompute_embeddings"):
+            classifier = IntentClassifier(model=Mock())
+        intents = list(classifier.intent_examples)
+        axis = {
+            example: i
+            for i, examples in enumerate(classifier.intent_examples.values())
+            for example in examples
+        }
+
+        def encode(texts, **kwargs):
+            rows = np.zeros((len(texts), len(intents)), dtype=np.float32)
+            for row, text in zip(rows, texts):
+                if text in axis:
+                    row[axis[text]] = 2.0
+                else:
+                    # Mostly greeting, partly farewell
+                    row[intents.index(IntentType.GREETING)] = 0.8
+                    row[intents.index(IntentType.FAREWELL)] = 0.6
+            return rows
+
+        classifier.model.encode.side_effect = encode
+        classifier._precompute_embeddings()
+        return classifier
+
+    def test_classify_matches_example(self, classifier):
+        intent, score = classifier.classify("hola")
+        assert intent == IntentType.GREETING
+        assert score == pytest.approx(1.0)
+
+    def test_classify_with_alternatives_ranked(self, classifier):
+        alternatives = classifier.classify_with_alternatives("hola amigos", top_k=3)
+        assert [intent for intent, _ in alternatives[:2]] == [
+            IntentType.GREETING,
+            IntentType.FAREWELL,
+        ]
+        # Tolerance also covers the optional int8 scoring
+        assert alternatives[0][1] == pytest.approx(0.8, abs=0.01)
+        assert alternatives[1][1] == pytest.approx(0.6, abs=0.01)
+        assert alternatives[2][1] == pytest.approx(0.0, abs=0.01)
+
+    @staticmethod
+    def _quantize(classifier):
+        from app.services.intent_classifier import _quantize_int8
+
+        classifier._all_emb_i8, classifier._row_scales = _quantize_int8(classifier._all_emb)
+
+    def test_quantized_scores_match_float(self, classifier):
+        import numpy as np
+
+        query = np.linspace(-1, 1, len(classifier.intent_examples), dtype=np.float32)
+        exact = classifier._intent_scores(query)
+
+        self._quantize(classifier)
+        quantized = classifier._intent_scores(query)
+
+        np.testing.assert_allclose(quantized, exact, atol=0.01)
+
+    def test_quantized_top_intent_matches_float(self, classifier):
+        import numpy as np
+
+        examples = [
+            example
+            for examples in classifier.intent_examples.values()
+            for example in examples
+        ]
+        queries = classifier.model.encode(examples + ["hola amigos"])
+        queries += np.random.default_rng(0).normal(0, 0.3, queries.shape).astype(np.float32)
+        exact = [classifier._best_intent(classifier._intent_scores(q))[0] for q in queries]
+
+        self._quantize(classifier)
+        quantized = [classifier._best_intent(classifier._intent_scores(q))[0] for q in queries]
+
+        assert quantized == exact
+
+    async def test_concurrent_async_queries_share_one_encode(self, classifier):
+        import asyncio
+
+        classifier.model.encode.reset_mock()
+        (greeting, _), alternatives, (farewell, _) = await asyncio.gather(
+            classifier.classify_async("hola"),
+            classifier.classify_with_alternatives_async("hola", top_k=2),
+            classifier.classify_async("hasta luego"),
+        )
+
+        assert greeting == IntentType.GREETING
+        assert alternatives[0][0] == IntentType.GREETING
+        assert farewell == IntentType.FAREWELL
+        classifier.model.encode.assert_called_once()
+        # Deduplicated and sorted by length
+        assert classifier.model.encode.call_args[0][0] == ["hola", "hasta luego"]
+
+    async def test_concurrent_embeddings_share_one_encode(self, classifier):
+        import asyncio
+        import numpy as np
+
+        classifier.model.encode.reset_mock()
+        greeting, farewell = await asyncio.gather(
+            classifier.get_embedding_async("hola amigos"),
+            classifier.get_embedding_async("adios amigos"),
+        )
+
+        classifier.model.encode.assert_called_once()
+        np.testing.assert_array_equal(greeting, classifier.get_embedding("hola amigos"))
+        np.testing.assert_array_equal(farewell, classifier.get_embedding("adios amigos"))
+
+    def test_redis_key_tracks_quantization_and_truncation(self, classifier):
+        classifier.model.max_seq_length = 128
+        classifier.settings = classifier.settings.model_copy(
+            update={"embedding_backend": "onnx", "onnx_quantize": False}
+        )
+        base = classifier._redis_key(1)
+
+        classifier.settings = classifier.settings.model_copy(update={"onnx_quantize": True})
+        quantized = classifier._redis_key(1)
+        classifier.model.max_seq_length = 256
+        longer = classifier._redis_key(1)
+
+        assert len({base, quantized, longer}) == 3
+
+    def test_repeated_queries_hit_embedding_cache(self, classifier):
+        classifier.model.encode.reset_mock()
+
+        first = classifier.classify("hola")
+        second = classifier.classify("hola")
+        classifier.classify_with_alternatives("hola")
+
+        assert first == second
+        classifier.model.encode.assert_called_once()
+
+
+class TestEntityExtractor:
+    @pytest.fixture
+    def extractor(self):
+        import spacy
+        from app.services.entity_extractor import EntityExtractor
+
+        return EntityExtractor(spacy.blank("es"))
+
+    @pytest.mark.parametrize("engine", ["hyperscan", "re2"])
+    def test_prefilter_keeps_unicode_digits_and_spaces(self, extractor, engine):
+        from app.services import entity_extractor
+
+        if getattr(entity_extractor, engine) is None:
+            pytest.skip(f"{engine} not installed")
+        # Force the engine under test, since Hyperscan is preferred when present
+        hyperscan = None if engine == "re2" else entity_extractor.hyperscan
+        with patch.object(entity_extractor, "hyperscan", hyperscan):
+            extractor._prefilter = extractor._build_prefilter()
+
+        entities = extractor.extract_entities("$１２３４５６７８ ticket ١٢٣٤٥٦٧٨")
+        found = {(e.type, e.value) for e in entities}
+        assert (EntityType.MONEY, "１２３４５６７８") in found
+        assert (EntityType.TICKET_ID, "١٢٣٤٥٦٧٨") in found
+
+        # \x1c-\x1f are whitespace to `re` (and not to Hyperscan's \s)
+        teams = {e.value for e in extractor.extract_entities("Real\x1cvs\x1cMadrid")}
+        assert teams == {"Real", "Madrid"}
+
+    def test_lone_surrogate_skips_prefilter(self, extractor):
+        # Not encodable as UTF-8, so the regex engines cannot scan it
+        entities = extractor._extract_with_regexes("ticket 12345678 \ud800")
+        assert (EntityType.TICKET_ID, "12345678") in {(e.type, e.value) for e in entities}
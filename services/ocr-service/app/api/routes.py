@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from typing import Optional
 import httpx
 import logging
 from .schemas import (
@@ -20,16 +21,72 @@ ocr_service = OCRService()
 preprocessor = ImagePreprocessor()
 settings = get_settings()
 
+# Process-wide client so connections (and TLS sessions) are reused; opened
+# and closed by the app lifespan
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """HTTP/2 client with a bounded keep-alive pool."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+
+
+async def start_http_client() -> None:
+    """Open the shared HTTP client."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client (created on demand outside the lifespan)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_http_client()
+    return _client
+
+
+async def download_image(url: str) -> bytearray:
+    """Stream an image into a single buffer, enforcing the configured size limit."""
+    async with get_http_client().stream("GET", url) as response:
+        response.raise_for_status()
+
+        content_length = int(response.headers.get("content-length", 0))
+        if content_length > settings.max_image_size:
+            raise ValueError(f"Image exceeds {settings.max_image_size} bytes")
+
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes(65536):
+            buffer.extend(chunk)
+            if len(buffer) > settings.max_image_size:
+                raise ValueError(f"Image exceeds {settings.max_image_size} bytes")
+        return buffer
+
 
 async def get_image_from_input(image_input: ImageInput):
     """Get image from base64 or URL."""
     if image_input.base64:
-        return preprocessor.decode_base64(image_input.base64)
+        return preprocessor.decode_base64(
+            image_input.base64, max_dimension=settings.decode_max_dimension
+        )
     elif image_input.url:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(image_input.url)
-            response.raise_for_status()
-            return preprocessor.bytes_to_image(response.content)
+        # Decode straight from the download buffer, without a bytes copy
+        buffer = await download_image(image_input.url)
+        return preprocessor.bytes_to_image(
+            memoryview(buffer), max_dimension=settings.decode_max_dimension
+        )
     else:
         raise HTTPException(status_code=400, detail="Either base64 or url must be provided")
 
@@ -51,7 +108,8 @@ async def extract_text(request: OCRRequest):
     try:
         image = await get_image_from_input(request.image)
 
-        result = ocr_service.extract_text(
+        result = await ocr_service.run_in_executor(
+            ocr_service.extract_text,
             image,
             lang=request.language,
         )
@@ -61,6 +119,8 @@ async def extract_text(request: OCRRequest):
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch image from URL: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to fetch image: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"OCR extraction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -71,12 +131,14 @@ async def extract_ticket(image: ImageInput):
     """Extract data from a betting ticket image."""
     try:
         img = await get_image_from_input(image)
-        result = ocr_service.extract_ticket_data(img)
+        result = await ocr_service.run_in_executor(ocr_service.extract_ticket_data, img)
         return TicketExtractionResponse(**result)
 
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch image from URL: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to fetch image: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Ticket extraction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -87,12 +149,14 @@ async def extract_document(image: ImageInput):
     """Extract data from an ID document image."""
     try:
         img = await get_image_from_input(image)
-        result = ocr_service.extract_document_data(img)
+        result = await ocr_service.run_in_executor(ocr_service.extract_document_data, img)
         return DocumentExtractionResponse(**result)
 
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch image from URL: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to fetch image: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Document extraction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from enum import Enum
 
 
 class ImageInput(BaseModel):
     """Input image for OCR processing."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     base64: Optional[str] = Field(None, description="Base64 encoded image")
     url: Optional[str] = Field(None, description="URL to image")
 
@@ -18,6 +19,7 @@ class ExtractionType(str, Enum):
 
 class OCRRequest(BaseModel):
     """Request for OCR processing."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     image: ImageInput
     extraction_type: ExtractionType = ExtractionType.GENERAL
     language: Optional[str] = Field(None, description="Override default language")
@@ -25,6 +27,7 @@ class OCRRequest(BaseModel):
 
 class OCRResponse(BaseModel):
     """Response from OCR processing."""
+    model_config = ConfigDict(frozen=True)
     success: bool
     text: Optional[str] = None
     confidence: Optional[float] = None
@@ -35,6 +38,7 @@ class OCRResponse(BaseModel):
 
 class TicketExtractionResponse(BaseModel):
     """Response from ticket extraction."""
+    model_config = ConfigDict(frozen=True)
     success: bool
     ticket_id: Optional[str] = None
     amount: Optional[float] = None
@@ -47,6 +51,7 @@ class TicketExtractionResponse(BaseModel):
 
 class DocumentExtractionResponse(BaseModel):
     """Response from document extraction."""
+    model_config = ConfigDict(frozen=True)
     success: bool
     document_number: Optional[str] = None
     full_name: Optional[str] = None
@@ -61,6 +66,7 @@ class DocumentExtractionResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = ConfigDict(frozen=True)
     status: str
     service: str
     version: str
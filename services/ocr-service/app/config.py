@@ -10,9 +10,14 @@ class Settings(BaseSettings):
     # Tesseract configuration
     tesseract_cmd: str | None = None  # Path to tesseract executable if not in PATH
     tesseract_lang: str = "spa+eng"  # Spanish + English
+    ocr_workers: int = 0  # OCR worker threads (0 = one per CPU)
+
+    # Result cache
+    result_cache_size: int = 256  # OCR results kept per image content (0 disables)
 
     # Image processing
     max_image_size: int = 10 * 1024 * 1024  # 10MB
+    decode_max_dimension: int = 1800  # Large JPEGs decode downscaled to about this longest edge (0 = full size)
     allowed_extensions: list[str] = ["jpg", "jpeg", "png", "bmp", "tiff", "webp"]
 
     class Config:
@@ -1,8 +1,11 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 from .config import get_settings
 from .api import router
+from .api.routes import start_http_client, close_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -12,12 +15,23 @@ logging.basicConfig(
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared HTTP client for image downloads, close it on shutdown."""
+    await start_http_client()
+    yield
+    await close_http_client()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="OCR Service for Sorti365 - Extracts text from images using Tesseract",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -2,24 +2,182 @@ import pytesseract
 from PIL import Image
 import numpy as np
 import re
+import asyncio
+import copy
 import logging
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+import xxhash
 from ..config import get_settings
 from ..utils import ImagePreprocessor
+from ..utils._parsing import parse_document_text, parse_ticket_text
+
+try:
+    import tesserocr
+except ImportError:  # Fall back to the tesseract CLI through pytesseract
+    tesserocr = None
 
 logger = logging.getLogger(__name__)
 
+# Tesseract config accepted by the in-process API ("--psm N" only)
+_PSM_CONFIG_PAT = re.compile(r"^\s*(?:--psm\s+(\d+))?\s*$")
+
 
 class OCRService:
     """OCR service using Tesseract with adaptive preprocessing."""
 
+    __slots__ = (
+        "settings",
+        "preprocessor",
+        "_lang",
+        "_tess_cmd",
+        "_cache_size",
+        "_local",
+        "executor",
+        "_result_cache",
+        "_cache_lock",
+    )
+
     def __init__(self):
         self.settings = get_settings()
         self.preprocessor = ImagePreprocessor()
 
+        # Plain copies of the settings read on every request
+        self._lang = self.settings.tesseract_lang
+        self._tess_cmd = self.settings.tesseract_cmd
+        self._cache_size = self.settings.result_cache_size
+
         # Configure Tesseract path if specified
-        if self.settings.tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = self.settings.tesseract_cmd
+        if self._tess_cmd:
+            pytesseract.pytesseract.tesseract_cmd = self._tess_cmd
+
+        # Each thread owns its tesserocr handles (per lang and psm), so
+        # recognitions run in parallel without sharing an API
+        self._local = threading.local()
+
+        # Workers for OCR requests; tesserocr releases the GIL while recognizing
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.settings.ocr_workers or os.cpu_count(),
+            thread_name_prefix="ocr",
+        )
+
+        # LRU of successful results keyed by image content and OCR settings,
+        # so re-uploaded images skip preprocessing and recognition
+        self._result_cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _tess_api(self, lang: str, psm: int) -> "tesserocr.PyTessBaseAPI":
+        """This thread's tesserocr handle for (lang, psm), created on first use."""
+        apis = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get((lang, psm))
+        if api is None:
+            api = apis[(lang, psm)] = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+        return api
+
+    async def run_in_executor(self, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking OCR method on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(method, *args, **kwargs))
+
+    def extract_batch(
+        self, images: list[np.ndarray], lang: Optional[str] = None
+    ) -> list[dict]:
+        """Extract text from several images in parallel, in input order."""
+        return list(self.executor.map(partial(self.extract_text, lang=lang), images))
+
+    def _recognize(
+        self,
+        image: np.ndarray,
+        lang: str,
+        config: str = "",
+        with_confidences: bool = True,
+    ) -> tuple[str, float, int]:
+        """
+        Run Tesseract once on a preprocessed (8-bit grayscale) image.
+
+        Returns the recognized text, the mean word confidence and the word
+        count (both 0 when `with_confidences` is False). Uses a resident
+        tesserocr handle when available, otherwise the tesseract CLI (also
+        for config beyond "--psm N").
+        """
+        psm_config = _PSM_CONFIG_PAT.match(config)
+        if tesserocr is not None and psm_config:
+            psm = int(psm_config.group(1) or tesserocr.PSM.AUTO)
+            api = self._tess_api(lang, psm)
+            try:
+                # Hand over the pixel buffer directly, without a PIL image
+                image = np.ascontiguousarray(image)
+                height, width = image.shape
+                api.SetImageBytes(image.tobytes(), width, height, 1, width)
+                text = api.GetUTF8Text()
+                if not with_confidences:
+                    return text, 0, 0
+                # Read straight from the recognition result, no TSV round-trip;
+                # like the CLI path, only words with a positive confidence count
+                confidences = [conf for conf in api.AllWordConfidences() if conf > 0]
+                avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+                return text, avg_confidence, len(confidences)
+            finally:
+                api.Clear()
+
+        pil_image = Image.fromarray(image)
+        text = pytesseract.image_to_string(pil_image, lang=lang, config=config)
+        if not with_confidences:
+            return text, 0, 0
+        data = pytesseract.image_to_data(
+            pil_image, lang=lang, config=config, output_type=pytesseract.Output.DICT
+        )
+
+        # Calculate average confidence
+        confidences = [int(conf) for conf in data["conf"] if int(conf) > 0]
+        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        return text, avg_confidence, len([w for w in data["text"] if w.strip()])
+
+    @staticmethod
+    def _cache_key(image: np.ndarray, *params: Any) -> tuple:
+        """Content-addressed key for an image plus the settings that shape the result."""
+        image = np.ascontiguousarray(image)
+        return (xxhash.xxh3_64_intdigest(image), image.shape, image.dtype.str, *params)
+
+    def _cache_get(self, key: tuple) -> Optional[dict]:
+        """Look up a cached result, marking it as recently used."""
+        with self._cache_lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: tuple, result: dict) -> None:
+        """Store a result, evicting the least recently used entries."""
+        if self._cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self._cache_size:
+                self._result_cache.popitem(last=False)
+
+    def _cached(self, image: Any, params: tuple, compute: Callable[[], dict]) -> dict:
+        """Cached result for `image` under `params`, computed (and cached) on a miss."""
+        if not isinstance(image, np.ndarray):
+            # Undecodable input; `compute` reports the failure as usual
+            return compute()
+
+        key = self._cache_key(image, *params)
+        result = self._cache_get(key)
+        if result is None:
+            result = compute()
+            # Failures may be transient, so only successes are kept
+            if result.get("success"):
+                self._cache_put(key, result)
+        # Results hold lists and dicts, so callers get their own copy
+        return copy.deepcopy(result)
 
     def extract_text(
         self,
@@ -38,34 +196,27 @@ class OCRService:
         Returns:
             Dictionary with extracted text and metadata
         """
-        lang = lang or self.settings.tesseract_lang
-
+        lang = lang or self._lang
+        return self._cached(
+            image,
+            ("text", lang, config),
+            partial(self._extract_text, image, lang, config),
+        )
+
+    def _extract_text(self, image: np.ndarray, lang: str, config: str) -> dict:
+        """Uncached extract_text."""
         try:
             # Preprocess image
             processed = self.preprocessor.preprocess_for_ocr(image)
 
-            # Convert to PIL Image for pytesseract
-            pil_image = Image.fromarray(processed)
-
-            # Extract text
-            text = pytesseract.image_to_string(pil_image, lang=lang, config=config)
-
-            # Get detailed data
-            data = pytesseract.image_to_data(
-                pil_image, lang=lang, config=config, output_type=pytesseract.Output.DICT
-            )
-
-            # Calculate average confidence
-            confidences = [
-                int(conf) for conf in data["conf"] if int(conf) > 0
-            ]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            # Extract text and word confidences in one recognition pass
+            text, avg_confidence, word_count = self._recognize(processed, lang, config)
 
             return {
                 "success": True,
                 "text": text.strip(),
                 "confidence": round(avg_confidence, 2),
-                "word_count": len([w for w in data["text"] if w.strip()]),
+                "word_count": word_count,
                 "language": lang,
             }
 
@@ -84,16 +235,24 @@ class OCRService:
 
         Returns structured data with ticket ID, amounts, events, etc.
         """
+        return self._cached(
+            image,
+            ("ticket", self._lang),
+            partial(self._extract_ticket_data, image),
+        )
+
+    def _extract_ticket_data(self, image: np.ndarray) -> dict:
+        """Uncached extract_ticket_data."""
         try:
             # Use specialized ticket preprocessing
             processed = self.preprocessor.preprocess_ticket(image)
-            pil_image = Image.fromarray(processed)
 
             # Extract text with single column mode for tickets
-            text = pytesseract.image_to_string(
-                pil_image,
-                lang=self.settings.tesseract_lang,
-                config="--psm 6",  # Assume single uniform block of text
+            text, _, _ = self._recognize(
+                processed,
+                self._lang,
+                "--psm 6",  # Assume single uniform block of text
+                with_confidences=False,
             )
 
             # Parse ticket data
@@ -117,16 +276,24 @@ class OCRService:
 
         Returns structured data with document number, name, dates, etc.
         """
+        return self._cached(
+            image,
+            ("document", self._lang),
+            partial(self._extract_document_data, image),
+        )
+
+    def _extract_document_data(self, image: np.ndarray) -> dict:
+        """Uncached extract_document_data."""
         try:
             # Use specialized document preprocessing
             processed = self.preprocessor.preprocess_document(image)
-            pil_image = Image.fromarray(processed)
 
             # Extract text
-            text = pytesseract.image_to_string(
-                pil_image,
-                lang=self.settings.tesseract_lang,
-                config="--psm 3",  # Fully automatic page segmentation
+            text, _, _ = self._recognize(
+                processed,
+                self._lang,
+                "--psm 3",  # Fully automatic page segmentation
+                with_confidences=False,
             )
 
             # Parse document data
@@ -146,125 +313,11 @@ class OCRService:
 
     def _parse_ticket_text(self, text: str) -> dict:
         """Parse betting ticket text to extract structured data."""
-        result = {
-            "ticket_id": None,
-            "amount": None,
-            "currency": None,
-            "date": None,
-            "events": [],
-        }
-
-        lines = text.split("\n")
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Try to find ticket ID (common patterns)
-            ticket_patterns = [
-                r"(?:ticket|boleto|comprobante|no\.?|#)\s*:?\s*(\d{6,})",
-                r"(?:ID|id)\s*:?\s*(\d{6,})",
-                r"^(\d{8,})$",  # Standalone long number
-            ]
-            for pattern in ticket_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match and not result["ticket_id"]:
-                    result["ticket_id"] = match.group(1)
-                    break
-
-            # Try to find amount
-            amount_patterns = [
-                r"(?:total|monto|apuesta|amount)\s*:?\s*\$?\s*([\d,]+\.?\d*)",
-                r"\$\s*([\d,]+\.?\d*)",
-                r"([\d,]+\.?\d*)\s*(?:USD|COP|MXN|PEN)",
-            ]
-            for pattern in amount_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match and not result["amount"]:
-                    amount_str = match.group(1).replace(",", "")
-                    try:
-                        result["amount"] = float(amount_str)
-                    except ValueError:
-                        pass
-                    break
-
-            # Try to find date
-            date_patterns = [
-                r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-                r"(\d{4}[/-]\d{1,2}[/-]\d{1,2})",
-            ]
-            for pattern in date_patterns:
-                match = re.search(pattern, line)
-                if match and not result["date"]:
-                    result["date"] = match.group(1)
-                    break
-
-            # Try to find currency
-            currency_match = re.search(r"(USD|COP|MXN|PEN|EUR|\$)", line, re.IGNORECASE)
-            if currency_match and not result["currency"]:
-                result["currency"] = currency_match.group(1).upper()
-
-        return result
+        return parse_ticket_text(text)
 
     def _parse_document_text(self, text: str) -> dict:
         """Parse ID document text to extract structured data."""
-        result = {
-            "document_number": None,
-            "full_name": None,
-            "first_name": None,
-            "last_name": None,
-            "date_of_birth": None,
-            "expiration_date": None,
-            "nationality": None,
-        }
-
-        lines = text.split("\n")
-        text_upper = text.upper()
-
-        # Try to find document number (cedula patterns)
-        doc_patterns = [
-            r"(?:cedula|c\.?c\.?|documento|dni|id)\s*:?\s*#?\s*([\d\.-]+)",
-            r"(?:numero|no\.?)\s*:?\s*([\d\.-]+)",
-            r"^([\d]{6,12})$",  # Standalone number
-        ]
-        for pattern in doc_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                doc_num = re.sub(r"[^\d]", "", match.group(1))
-                if len(doc_num) >= 6:
-                    result["document_number"] = doc_num
-                    break
-
-        # Try to find dates
-        date_patterns = [
-            (r"(?:nacimiento|birth|fecha nac)[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})", "date_of_birth"),
-            (r"(?:vencimiento|expir|valid)[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})", "expiration_date"),
-        ]
-        for pattern, field in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                result[field] = match.group(1)
-
-        # Try to find names
-        name_patterns = [
-            r"(?:nombres?|first name)[:\s]*([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+)",
-            r"(?:apellidos?|last name|surname)[:\s]*([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+)",
-        ]
-        for i, pattern in enumerate(name_patterns):
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                name = match.group(1).strip()
-                if i == 0:
-                    result["first_name"] = name
-                else:
-                    result["last_name"] = name
-
-        # Combine names if both found
-        if result["first_name"] and result["last_name"]:
-            result["full_name"] = f"{result['first_name']} {result['last_name']}"
-
-        return result
+        return parse_document_text(text)
 
     def get_tesseract_version(self) -> str:
         """Get Tesseract version for health check."""
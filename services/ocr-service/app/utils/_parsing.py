@@ -0,0 +1,307 @@
+"""
+Field extraction from OCR text for tickets and ID documents.
+
+Kept free of service state and fully annotated so the Docker build can
+compile it with mypyc; it runs as plain Python when not compiled. It lives
+in `app.utils` because a mypyc module cannot be imported while its parent
+package is still initializing (as `app.services` is when OCRService loads).
+"""
+import re
+import logging
+import threading
+from typing import Any, Callable, Optional
+from sorti365_shared.unicode_patterns import unicode_classes
+
+try:
+    import hyperscan
+except ImportError:  # Fall back to running every parser pattern
+    hyperscan = None  # type: ignore[assignment]
+
+try:
+    import re2
+except ImportError:  # Fall back to an RE2 set, or to running every pattern
+    re2 = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def _line_pattern(expression: str, flags: int = 0) -> re.Pattern:
+    """
+    Compile a pattern written for one stripped line to scan whole texts.
+
+    Whitespace never crosses a newline and anchors tolerate the leading and
+    trailing whitespace that stripping would have removed.
+    """
+    expression = expression.replace(r"\s", r"[^\S\n]")
+    if expression.startswith("^"):
+        expression = r"^[^\S\n]*" + expression[1:]
+    if expression.endswith("$"):
+        expression = expression[:-1] + r"[^\S\n]*$"
+    return re.compile(expression, flags | re.MULTILINE)
+
+
+# Date forms shared by the ticket and document patterns
+_DMY_DATE = r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
+_YMD_DATE = r"\d{4}[/-]\d{1,2}[/-]\d{1,2}"
+
+# Ticket field patterns, in priority order within a line
+_TICKET_ID_PATS = tuple(
+    _line_pattern(p, re.IGNORECASE)
+    for p in (
+        r"(?:ticket|boleto|comprobante|no\.?|#)\s*:?\s*(\d{6,})",
+        r"(?:ID|id)\s*:?\s*(\d{6,})",
+        r"^(\d{8,})$",  # Standalone long number
+    )
+)
+_AMOUNT_PATS = tuple(
+    _line_pattern(p, re.IGNORECASE)
+    for p in (
+        r"(?:total|monto|apuesta|amount)\s*:?\s*\$?\s*([\d,]+\.?\d*)",
+        r"\$\s*([\d,]+\.?\d*)",
+        r"([\d,]+\.?\d*)\s*(?:USD|COP|MXN|PEN)",
+    )
+)
+_DATE_PATS = tuple(_line_pattern(f"({p})") for p in (_DMY_DATE, _YMD_DATE))
+_CURRENCY_PAT = _line_pattern(r"(USD|COP|MXN|PEN|EUR|\$)", re.IGNORECASE)
+
+# Document field patterns, searched over the whole text
+_DOC_NUM_PATS = tuple(
+    re.compile(p, re.IGNORECASE | re.MULTILINE)
+    for p in (
+        r"(?:cedula|c\.?c\.?|documento|dni|id)\s*:?\s*#?\s*([\d\.-]+)",
+        r"(?:numero|no\.?)\s*:?\s*([\d\.-]+)",
+        r"^([\d]{6,12})$",  # Standalone number
+    )
+)
+_DOC_DATE_PATS = (
+    (
+        re.compile(rf"(?:nacimiento|birth|fecha nac)[:\s]*({_DMY_DATE})", re.IGNORECASE),
+        "date_of_birth",
+    ),
+    (
+        re.compile(rf"(?:vencimiento|expir|valid)[:\s]*({_DMY_DATE})", re.IGNORECASE),
+        "expiration_date",
+    ),
+)
+_NAME_PATS = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"(?:nombres?|first name)[:\s]*([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+)",
+        r"(?:apellidos?|last name|surname)[:\s]*([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+)",
+    )
+)
+_NON_DIGIT_PAT = re.compile(r"[^\d]")
+
+
+def _build_prefilter(
+    patterns: tuple[re.Pattern, ...]
+) -> Optional[Callable[[str], set[re.Pattern]]]:
+    """
+    Compile one parser's patterns into a multi-pattern matcher.
+
+    A single scan of the OCR text reports which patterns occur anywhere in
+    it, so the parser only runs `re` (which extracts the capture groups)
+    for those. The matcher's hits are a superset of the `re` ones, so
+    skipping a pattern never changes the result. Uses Hyperscan, else an
+    RE2 set; returns None when neither is installed.
+    """
+    try:
+        if hyperscan is not None:
+            return _build_hyperscan_prefilter(patterns)
+        if re2 is not None:
+            return _build_re2_prefilter(patterns)
+    except Exception as e:
+        logger.warning(f"Parser prefilter unavailable, running all patterns: {str(e)}")
+    return None
+
+
+def _build_hyperscan_prefilter(
+    patterns: tuple[re.Pattern, ...]
+) -> Callable[[str], set[re.Pattern]]:
+    """Compile the patterns into a Hyperscan block-mode database."""
+    expressions = [unicode_classes(p.pattern) for p in patterns]
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_MULTILINE
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[e.encode("utf-8") for e in expressions],
+        ids=list(range(len(expressions))),
+        flags=[flags] * len(expressions),
+    )
+
+    # Scratch space must not be shared between concurrent scans
+    local = threading.local()
+
+    def scan(text: str) -> set[re.Pattern]:
+        scratch = getattr(local, "scratch", None)
+        if scratch is None:
+            scratch = local.scratch = hyperscan.Scratch(database)
+        hits: set[re.Pattern] = set()
+
+        def on_match(expression_id, start, end, flags, context):
+            hits.add(patterns[expression_id])
+            # Stop scanning once every pattern has been seen
+            return len(hits) == len(patterns)
+
+        try:
+            database.scan(text.encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            pass
+        return hits
+
+    return scan
+
+
+def _build_re2_prefilter(
+    patterns: tuple[re.Pattern, ...]
+) -> Callable[[str], set[re.Pattern]]:
+    """Compile the patterns into an RE2 set (used where Hyperscan is unavailable)."""
+    pattern_set = re2.Set.SearchSet(re2.Options())
+    for pattern in patterns:
+        pattern_set.Add("(?im)" + unicode_classes(pattern.pattern))
+    pattern_set.Compile()
+
+    def scan(text: str) -> set[re.Pattern]:
+        return {patterns[i] for i in pattern_set.Match(text.encode("utf-8")) or ()}
+
+    return scan
+
+
+# One matcher per parser, so neither scans for the other's fields
+_TICKET_PREFILTER = _build_prefilter(
+    (*_TICKET_ID_PATS, *_AMOUNT_PATS, *_DATE_PATS, _CURRENCY_PAT)
+)
+_DOCUMENT_PREFILTER = _build_prefilter(
+    (*_DOC_NUM_PATS, *[p for p, _ in _DOC_DATE_PATS], *_NAME_PATS)
+)
+
+
+def _line_end(text: str, pos: int) -> int:
+    """Index of the newline ending the line that contains `pos` (or len(text))."""
+    end = text.find("\n", pos)
+    return len(text) if end < 0 else end
+
+
+def _first_line_match(
+    patterns: tuple[re.Pattern, ...],
+    text: str,
+    hits: Optional[set[re.Pattern]] = None,
+    pos: int = 0,
+) -> Optional[re.Match]:
+    """
+    Match from the first line (at or after `pos`) where any pattern matches.
+
+    Within that line the earliest pattern in `patterns` wins, as if each
+    line were tried against the patterns in order.
+    """
+    best: Optional[re.Match] = None
+    endpos = len(text)
+    for pattern in patterns:
+        if hits is not None and pattern not in hits:
+            continue
+        # Only a match on an earlier line than the current best can win
+        match = pattern.search(text, pos, endpos)
+        if match and (best is None or match.start() < best.start()):
+            best = match
+            endpos = text.rfind("\n", 0, match.start()) + 1
+    return best
+
+
+def parse_ticket_text(text: str) -> dict[str, Any]:
+    """Parse betting ticket text to extract structured data."""
+    result: dict[str, Any] = {
+        "ticket_id": None,
+        "amount": None,
+        "currency": None,
+        "date": None,
+        "events": [],
+    }
+
+    hits = _TICKET_PREFILTER(text) if _TICKET_PREFILTER else None
+
+    # Try to find ticket ID (common patterns)
+    match = _first_line_match(_TICKET_ID_PATS, text, hits)
+    if match:
+        result["ticket_id"] = match.group(1)
+
+    # Try to find amount; lines whose amount does not parse are skipped
+    pos = 0
+    while not result["amount"]:
+        match = _first_line_match(_AMOUNT_PATS, text, hits, pos)
+        if match is None:
+            break
+        amount_str = match.group(1).replace(",", "")
+        try:
+            result["amount"] = float(amount_str)
+        except ValueError:
+            pass
+        pos = _line_end(text, match.start()) + 1
+
+    # Try to find date
+    match = _first_line_match(_DATE_PATS, text, hits)
+    if match:
+        result["date"] = match.group(1)
+
+    # Try to find currency
+    match = _first_line_match((_CURRENCY_PAT,), text, hits)
+    if match:
+        result["currency"] = match.group(1).upper()
+
+    return result
+
+
+def parse_document_text(text: str) -> dict[str, Any]:
+    """Parse ID document text to extract structured data."""
+    result: dict[str, Any] = {
+        "document_number": None,
+        "full_name": None,
+        "first_name": None,
+        "last_name": None,
+        "date_of_birth": None,
+        "expiration_date": None,
+        "nationality": None,
+    }
+
+    hits = _DOCUMENT_PREFILTER(text) if _DOCUMENT_PREFILTER else None
+
+    # Try to find document number (cedula patterns)
+    for pattern in _DOC_NUM_PATS:
+        if hits is not None and pattern not in hits:
+            continue
+        match = pattern.search(text)
+        if match:
+            doc_num = _NON_DIGIT_PAT.sub("", match.group(1))
+            if len(doc_num) >= 6:
+                result["document_number"] = doc_num
+                break
+
+    # Try to find dates
+    for pattern, field in _DOC_DATE_PATS:
+        if hits is not None and pattern not in hits:
+            continue
+        match = pattern.search(text)
+        if match:
+            result[field] = match.group(1)
+
+    # Try to find names
+    for i, pattern in enumerate(_NAME_PATS):
+        if hits is not None and pattern not in hits:
+            continue
+        match = pattern.search(text)
+        if match:
+            name = match.group(1).strip()
+            if i == 0:
+                result["first_name"] = name
+            else:
+                result["last_name"] = name
+
+    # Combine names if both found
+    if result["first_name"] and result["last_name"]:
+        result["full_name"] = f"{result['first_name']} {result['last_name']}"
+
+    return result
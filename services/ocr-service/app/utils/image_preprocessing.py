@@ -3,29 +3,152 @@ import numpy as np
 from PIL import Image
 import io
 import base64
-from typing import Tuple
+import binascii
+import logging
+import threading
+from typing import Optional, Tuple
+
+try:
+    import pybase64
+except ImportError:  # Fall back to the standard library decoder
+    pybase64 = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+except ImportError:  # Fall back to OpenCV for JPEGs
+    TurboJPEG = None
+
+logger = logging.getLogger(__name__)
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+# JPEG decode scale-downs libjpeg does in the DCT domain, largest first
+_JPEG_SCALES = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Wider than a text stroke, so a closing estimates the page background
+_SHADOW_KERNEL = np.ones((15, 15), np.uint8)
+
+
+def _load_turbojpeg():
+    """Load libjpeg-turbo bindings, or None when the library is missing."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except Exception as e:
+        logger.warning(f"libturbojpeg unavailable, decoding JPEGs with OpenCV: {str(e)}")
+        return None
+
+
+_turbojpeg = _load_turbojpeg()
+
+
+def _jpeg_scale(image_bytes: bytes | bytearray | memoryview, max_dimension: int) -> int:
+    """
+    Largest JPEG decode scale-down (1, 2, 4 or 8) that keeps the longest
+    edge at or above `max_dimension`, read from the header alone.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as pil_image:
+            longest = max(pil_image.size)
+    except Exception:
+        return 1
+    for scale, _ in _JPEG_SCALES:
+        if longest >= scale * max_dimension:
+            return scale
+    return 1
 
 
 class ImagePreprocessor:
     """Adaptive image preprocessing for OCR optimization."""
 
-    @staticmethod
-    def decode_base64(base64_string: str) -> np.ndarray:
-        """Decode base64 string to OpenCV image."""
-        # Remove data URL prefix if present
-        if "," in base64_string:
-            base64_string = base64_string.split(",")[1]
+    def __init__(self):
+        # CLAHE objects keep scratch buffers between calls, so each thread
+        # gets its own instead of one shared across the OCR workers
+        self._local = threading.local()
 
-        image_bytes = base64.b64decode(base64_string)
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        return image
+    @property
+    def clahe(self) -> cv2.CLAHE:
+        """This thread's CLAHE instance, created on first use."""
+        clahe = getattr(self._local, "clahe", None)
+        if clahe is None:
+            clahe = self._local.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return clahe
+
+    def _scratch_pair(self, shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Two uint8 scratch images of `shape` for ping-ponging pipeline stages.
+
+        Views into per-thread buffers that only grow, so repeated requests
+        reuse the same memory whatever their exact dimensions.
+        """
+        size = shape[0] * shape[1]
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None or buffers[0].size < size:
+            buffers = self._local.buffers = (np.empty(size, np.uint8), np.empty(size, np.uint8))
+        return buffers[0][:size].reshape(shape), buffers[1][:size].reshape(shape)
+
+    @staticmethod
+    def decode_base64(base64_string: str, max_dimension: int = 0) -> np.ndarray:
+        """Decode base64 string to OpenCV image (see bytes_to_image)."""
+        # Remove data URL prefix if present (one slice, no split list)
+        comma = base64_string.find(",")
+        if comma >= 0:
+            base64_string = base64_string[comma + 1:]
+
+        if pybase64 is not None:
+            # SIMD decoder; the bytearray is decoded from without another copy.
+            # Only strict decoding takes the SIMD path, so fall back to the
+            # lenient one for input with line breaks or other stray characters
+            try:
+                image_bytes = pybase64.b64decode_as_bytearray(base64_string, validate=True)
+            except binascii.Error:
+                image_bytes = pybase64.b64decode_as_bytearray(base64_string)
+        else:
+            image_bytes = base64.b64decode(base64_string)
+        return ImagePreprocessor.bytes_to_image(image_bytes, max_dimension)
 
     @staticmethod
-    def bytes_to_image(image_bytes: bytes) -> np.ndarray:
-        """Convert bytes to OpenCV image."""
+    def bytes_to_image(
+        image_bytes: bytes | bytearray | memoryview, max_dimension: int = 0
+    ) -> np.ndarray:
+        """
+        Convert bytes (or any bytes-like buffer, without copying) to OpenCV image.
+
+        JPEGs go through libjpeg-turbo when available, other formats through
+        OpenCV, and anything OpenCV cannot read through PIL.
+
+        With `max_dimension` set, JPEGs at least twice that size are decoded
+        at 1/2, 1/4 or 1/8 scale (never below `max_dimension`), which libjpeg
+        does for a fraction of the full decode cost.
+        """
+        header = bytes(image_bytes[:64])
+        is_jpeg = header.startswith(_JPEG_MAGIC)
+        scale = _jpeg_scale(image_bytes, max_dimension) if is_jpeg and max_dimension else 1
+
+        # cv2 applies EXIF orientation (TurboJPEG does not), so keep EXIF
+        # photos on the OpenCV path
+        if _turbojpeg is not None and is_jpeg and b"Exif" not in header:
+            try:
+                return _turbojpeg.decode(
+                    image_bytes, pixel_format=TJPF_BGR, scaling_factor=(1, scale)
+                )
+            except Exception as e:
+                logger.debug(f"TurboJPEG decode failed, retrying with OpenCV: {str(e)}")
+
         nparr = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        flags = dict(_JPEG_SCALES).get(scale, cv2.IMREAD_COLOR)
+        image = cv2.imdecode(nparr, flags)
+        if image is None:
+            try:
+                with Image.open(io.BytesIO(image_bytes)) as pil_image:
+                    image = ImagePreprocessor.pil_to_cv2(pil_image.convert("RGB"))
+            except Exception:
+                return None
         return image
 
     @staticmethod
@@ -40,7 +163,7 @@ class ImagePreprocessor:
 
     @staticmethod
     def resize_if_needed(
-        image: np.ndarray, max_dimension: int = 4000
+        image: np.ndarray, max_dimension: int = 2000
     ) -> Tuple[np.ndarray, float]:
         """Resize image if it exceeds max dimension. Returns image and scale factor."""
         height, width = image.shape[:2]
@@ -56,15 +179,20 @@ class ImagePreprocessor:
         return resized, scale
 
     @staticmethod
-    def convert_to_grayscale(image: np.ndarray) -> np.ndarray:
+    def convert_to_grayscale(
+        image: np.ndarray, dst: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Convert image to grayscale."""
         if len(image.shape) == 2:
             return image
-        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst)
 
     @staticmethod
     def apply_adaptive_threshold(
-        gray_image: np.ndarray, block_size: int = 11, c: int = 2
+        gray_image: np.ndarray,
+        block_size: int = 11,
+        c: int = 2,
+        dst: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """Apply adaptive thresholding for better text extraction."""
         return cv2.adaptiveThreshold(
@@ -74,90 +202,81 @@ class ImagePreprocessor:
             cv2.THRESH_BINARY,
             block_size,
             c,
+            dst,
         )
 
     @staticmethod
-    def denoise(image: np.ndarray) -> np.ndarray:
-        """Apply denoising filter."""
+    def denoise(
+        image: np.ndarray, high_quality: bool = False, dst: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Apply denoising filter.
+
+        Edge-preserving blurs by default; `high_quality` uses non-local means,
+        which is much slower and rarely changes the OCR result.
+        """
+        if high_quality:
+            if len(image.shape) == 2:
+                return cv2.fastNlMeansDenoising(image, dst, 10, 7, 21)
+            return cv2.fastNlMeansDenoisingColored(image, dst, 10, 10, 7, 21)
+
         if len(image.shape) == 2:
-            return cv2.fastNlMeansDenoising(image, None, 10, 7, 21)
-        return cv2.fastNlMeansDenoisingColored(image, None, 10, 10, 7, 21)
+            return cv2.GaussianBlur(image, (3, 3), 0, dst)
+        return cv2.bilateralFilter(image, 5, 50, 50, dst)
 
     @staticmethod
-    def deskew(image: np.ndarray) -> np.ndarray:
-        """Deskew image using projection profile method."""
+    def deskew(image: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Deskew image using the minimum-area rectangle around the text."""
         gray = (
             image
             if len(image.shape) == 2
             else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         )
 
-        # Detect edges
-        edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-
-        # Detect lines using Hough transform
-        lines = cv2.HoughLinesP(
-            edges, 1, np.pi / 180, threshold=100, minLineLength=100, maxLineGap=10
-        )
-
-        if lines is None:
+        # Foreground (dark text) pixels as (x, y) points
+        bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+        points = cv2.findNonZero(bw)
+        if points is None:
             return image
 
-        # Calculate angles of detected lines
-        angles = []
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            angle = np.degrees(np.arctan2(y2 - y1, x2 - x1))
-            if -45 < angle < 45:  # Filter near-horizontal lines
-                angles.append(angle)
-
-        if not angles:
+        # The rectangle's angle is in [0, 90); fold it to the near-horizontal skew
+        angle = cv2.minAreaRect(points)[-1]
+        if angle > 45:
+            angle -= 90
+        if angle == 0:
             return image
 
-        # Get median angle
-        median_angle = np.median(angles)
-
         # Rotate image
         (h, w) = image.shape[:2]
         center = (w // 2, h // 2)
-        M = cv2.getRotationMatrix2D(center, median_angle, 1.0)
+        M = cv2.getRotationMatrix2D(center, angle, 1.0)
         rotated = cv2.warpAffine(
-            image, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE
+            image,
+            M,
+            (w, h),
+            dst,
+            flags=cv2.INTER_CUBIC,
+            borderMode=cv2.BORDER_REPLICATE,
         )
 
         return rotated
 
-    @staticmethod
-    def enhance_contrast(image: np.ndarray) -> np.ndarray:
-        """Enhance image contrast using CLAHE."""
-        if len(image.shape) == 3:
-            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            l = clahe.apply(l)
-            lab = cv2.merge([l, a, b])
-            return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
-        else:
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            return clahe.apply(image)
+    def enhance_contrast(
+        self, image: np.ndarray, dst: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Enhance the contrast of a grayscale image using CLAHE."""
+        return self.clahe.apply(image, dst)
 
     @staticmethod
-    def remove_shadows(image: np.ndarray) -> np.ndarray:
+    def remove_shadows(
+        image: np.ndarray, dst: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Remove shadows from image."""
-        if len(image.shape) == 3:
-            rgb_planes = cv2.split(image)
-            result_planes = []
-            for plane in rgb_planes:
-                dilated = cv2.dilate(plane, np.ones((7, 7), np.uint8))
-                bg = cv2.medianBlur(dilated, 21)
-                diff = 255 - cv2.absdiff(plane, bg)
-                result_planes.append(cv2.normalize(diff, None, 0, 255, cv2.NORM_MINMAX))
-            return cv2.merge(result_planes)
-        else:
-            dilated = cv2.dilate(image, np.ones((7, 7), np.uint8))
-            bg = cv2.medianBlur(dilated, 21)
-            diff = 255 - cv2.absdiff(image, bg)
-            return cv2.normalize(diff, None, 0, 255, cv2.NORM_MINMAX)
+        # A closing wipes out the (dark) text and leaves the illumination;
+        # OpenCV runs it over all channels at once
+        bg = cv2.morphologyEx(image, cv2.MORPH_CLOSE, _SHADOW_KERNEL)
+        diff = 255 - cv2.absdiff(image, bg)
+        return cv2.normalize(diff, dst, 0, 255, cv2.NORM_MINMAX)
 
     def preprocess_for_ocr(
         self,
@@ -167,6 +286,8 @@ class ImagePreprocessor:
         enhance_contrast: bool = True,
         remove_shadows: bool = False,
         binarize: bool = False,
+        high_quality: bool = False,
+        max_dimension: int = 1800,
     ) -> np.ndarray:
         """
         Apply full preprocessing pipeline for OCR.
@@ -178,36 +299,50 @@ class ImagePreprocessor:
             enhance_contrast: Apply CLAHE contrast enhancement
             remove_shadows: Remove shadows from image
             binarize: Convert to binary image
+            high_quality: Denoise with (slow) non-local means
+            max_dimension: Longest edge before any other stage runs; Tesseract
+                does best around 300 DPI, and every stage scales with pixels
 
         Returns:
             Preprocessed image optimized for OCR
         """
         # Resize if too large
-        processed, _ = self.resize_if_needed(image)
+        processed, _ = self.resize_if_needed(image, max_dimension)
 
-        # Remove shadows first if needed
+        # Grayscale stages write into two reused scratch buffers in turn
+        scratch = self._scratch_pair(processed.shape[:2])
+
+        def target(current: np.ndarray) -> np.ndarray:
+            return scratch[1] if current is scratch[0] else scratch[0]
+
+        # Convert to grayscale once, up front (a no-op for gray input); every
+        # stage only needs luminance, so none of them touches three channels
+        # and CLAHE runs on it directly (no LAB round-trip)
+        gray = self.convert_to_grayscale(processed, dst=scratch[0])
+
+        # Remove shadows if needed
         if remove_shadows:
-            processed = self.remove_shadows(processed)
+            gray = self.remove_shadows(gray, dst=target(gray))
 
         # Enhance contrast
         if enhance_contrast:
-            processed = self.enhance_contrast(processed)
+            gray = self.enhance_contrast(gray, dst=target(gray))
 
         # Denoise
         if denoise:
-            processed = self.denoise(processed)
+            gray = self.denoise(gray, high_quality=high_quality, dst=target(gray))
 
         # Deskew
         if deskew:
-            processed = self.deskew(processed)
-
-        # Convert to grayscale for OCR
-        gray = self.convert_to_grayscale(processed)
+            gray = self.deskew(gray, dst=target(gray))
 
         # Binarize if requested
         if binarize:
-            gray = self.apply_adaptive_threshold(gray)
+            gray = self.apply_adaptive_threshold(gray, dst=target(gray))
 
+        # The scratch buffers are reused by the next call on this thread
+        if gray is scratch[0] or gray is scratch[1]:
+            gray = gray.copy()
         return gray
 
     def preprocess_ticket(self, image: np.ndarray) -> np.ndarray:
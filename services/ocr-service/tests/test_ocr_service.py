@@ -36,6 +36,29 @@ class TestImagePreprocessor:
         # Test would require actual image data
         assert preprocessor is not None
 
+    def test_enhance_contrast_writes_into_dst(self):
+        import numpy as np
+
+        preprocessor = ImagePreprocessor()
+        image = np.tile(np.arange(100, 140, dtype=np.uint8), (40, 1))
+        dst = np.empty_like(image)
+
+        result = preprocessor.enhance_contrast(image, dst=dst)
+
+        assert result is dst
+        assert np.ptp(result) > np.ptp(image)
+
+    def test_bytes_to_image_decodes_large_jpeg_reduced(self):
+        import cv2
+        import numpy as np
+
+        image = np.full((400, 300, 3), 200, dtype=np.uint8)
+        data = cv2.imencode(".jpg", image)[1].tobytes()
+
+        assert ImagePreprocessor.bytes_to_image(data).shape == (400, 300, 3)
+        assert ImagePreprocessor.bytes_to_image(data, max_dimension=100).shape == (100, 75, 3)
+        assert ImagePreprocessor.bytes_to_image(data, max_dimension=250).shape == (400, 300, 3)
+
 
 class TestOCRService:
     @pytest.fixture
@@ -55,6 +78,75 @@ class TestOCRService:
         # The actual test would need proper image handling
         assert mock_tesseract is not None
 
+    def test_repeated_image_hits_result_cache(self, ocr_service):
+        import numpy as np
+
+        image = np.full((8, 8), 255, dtype=np.uint8)
+        with patch.object(
+            OCRService, "_extract_text", return_value={"success": True, "text": "hola"}
+        ) as mock_extract:
+            first = ocr_service.extract_text(image)
+            second = ocr_service.extract_text(image.copy())
+            ocr_service.extract_text(image, lang="eng")
+
+        assert first == second == {"success": True, "text": "hola"}
+        assert mock_extract.call_count == 2
+
+    def test_cached_result_is_not_shared_with_callers(self, ocr_service):
+        import numpy as np
+
+        image = np.full((8, 8), 255, dtype=np.uint8)
+        with patch.object(
+            OCRService, "_extract_ticket_data", return_value={"success": True, "events": []}
+        ):
+            ocr_service.extract_ticket_data(image)["events"].append("mutated")
+            assert ocr_service.extract_ticket_data(image)["events"] == []
+
+    def test_undecodable_image_returns_failure_result(self, ocr_service):
+        for extract in (
+            ocr_service.extract_text,
+            ocr_service.extract_ticket_data,
+            ocr_service.extract_document_data,
+        ):
+            result = extract(None)
+            assert result["success"] is False
+            assert "error" in result
+
+    def test_tesserocr_counts_only_confident_words(self, ocr_service):
+        import numpy as np
+
+        api = Mock()
+        api.GetUTF8Text.return_value = "hola mundo"
+        api.AllWordConfidences.return_value = [90, 0, 70]
+        with patch("app.services.ocr_service.tesserocr"), patch.object(
+            OCRService, "_tess_api", return_value=api
+        ):
+            result = ocr_service._recognize(np.zeros((4, 4), dtype=np.uint8), "spa", "--psm 6")
+
+        assert result == ("hola mundo", 80, 2)
+
+    def test_parse_ticket_text(self, ocr_service):
+        text = "BETPLAY\n  Ticket: 12345678\nTotal: $,\nApuesta $ 1,500.50 COP\n12/05/2024"
+        result = ocr_service._parse_ticket_text(text)
+
+        assert result["ticket_id"] == "12345678"
+        # The first amount does not parse, so the next line's is used
+        assert result["amount"] == 1500.5
+        assert result["currency"] == "$"
+        assert result["date"] == "12/05/2024"
+
+    def test_parse_ticket_text_prefers_pattern_order_within_line(self, ocr_service):
+        result = ocr_service._parse_ticket_text("id: 1234567 ticket 7654321\n  87654321  ")
+        assert result["ticket_id"] == "7654321"
+
+    def test_parse_document_text(self, ocr_service):
+        text = "CEDULA: 1.234.567.890\nFecha nacimiento: 01/02/1990\nvalid 12/12/2029"
+        result = ocr_service._parse_document_text(text)
+
+        assert result["document_number"] == "1234567890"
+        assert result["date_of_birth"] == "01/02/1990"
+        assert result["expiration_date"] == "12/12/2029"
+
 
 class TestExtractEndpoint:
     def test_extract_requires_image(self):
@@ -79,6 +171,24 @@ class TestExtractEndpoint:
         assert response.status_code in [200, 500]
 
 
+    def test_extra_result_keys_are_ignored(self):
+        test_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8DwHwAFBQIAX8jx0gAAAABJRU5ErkJggg=="
+        result = {"success": True, "text": "hola", "engine": "tesseract"}
+
+        with patch.object(OCRService, "extract_text", return_value=result):
+            response = client.post("/api/ocr/extract", json={"image": {"base64": test_image}})
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "hola"
+
+    def test_unknown_request_field_is_rejected(self):
+        response = client.post("/api/ocr/extract", json={
+            "image": {"url": "https://example.com/ticket.png"},
+            "lang": "spa",
+        })
+        assert response.status_code == 422
+
+
 class TestTicketExtraction:
     @patch("app.services.ocr_service.OCRService.extract_ticket_info")
     def test_extract_ticket_success(self, mock_extract):
@@ -128,6 +238,15 @@ class TestErrorHandling:
         # Should return error for invalid base64
         assert response.status_code in [400, 422, 500]
 
+    def test_undecodable_base64_image(self):
+        # Valid base64, but not an image
+        response = client.post("/api/ocr/extract/ticket", json={
+            "base64": base64.b64encode(b"not an image").decode()
+        })
+
+        assert response.status_code == 200
+        assert response.json()["success"] is False
+
     def test_empty_image(self):
         response = client.post("/api/ocr/extract", json={
             "image_base64": ""
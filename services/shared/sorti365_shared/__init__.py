@@ -0,0 +1,11 @@
+from .embedding_batcher import EmbeddingBatcher, MicroBatcher
+from .onnx_encoder import OnnxEncoder
+from .unicode_patterns import UNICODE_SPACE, unicode_classes
+
+__all__ = [
+    "EmbeddingBatcher",
+    "MicroBatcher",
+    "OnnxEncoder",
+    "UNICODE_SPACE",
+    "unicode_classes",
+]
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent requests into a single batch call.
+
+    Requests arriving within `max_wait_ms` of each other (or until
+    `max_batch` texts are queued) are merged, deduplicated and sorted by
+    length so padding stays small, processed once on the executor by
+    `process` (one result per input text), and split back per request.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list[str]], Sequence[Any]],
+        executor: Optional[Executor] = None,
+        max_wait_ms: float = 5.0,
+        max_batch: int = 32,
+    ):
+        self._process = process
+        self._executor = executor
+        self._max_wait = max_wait_ms / 1000
+        self._max_batch = max_batch
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks, so in-flight batches
+        # are held here until they finish
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, texts: list[str]) -> Sequence[Any]:
+        """Queue texts for the next batch and wait for their results."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+
+        if self._pending_texts >= self._max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the queued requests to a background task."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        self._pending_texts = 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[list[str], asyncio.Future]]) -> None:
+        """Process one batch on the executor and resolve each request."""
+        # Identical texts (e.g. classify + alternatives for one query) run once
+        unique = sorted(
+            dict.fromkeys(text for request_texts, _ in batch for text in request_texts),
+            key=len,
+        )
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(self._executor, self._process, unique)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Processed {len(unique)} texts for {len(batch)} batched requests")
+        row = {text: i for i, text in enumerate(unique)}
+        for request_texts, future in batch:
+            if not future.done():
+                future.set_result(self._select(results, [row[text] for text in request_texts]))
+
+    def _select(self, results: Sequence[Any], rows: list[int]) -> Sequence[Any]:
+        """Pick one request's results out of the batch results."""
+        return [results[i] for i in rows]
+
+
+class EmbeddingBatcher(MicroBatcher):
+    """Micro-batcher for an encoder returning one embedding row per text."""
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        """Queue texts for the next batch and wait for their embeddings."""
+        return await self.submit(texts)
+
+    def _select(self, results: np.ndarray, rows: list[int]) -> np.ndarray:
+        """Pick one request's rows out of the batch embeddings."""
+        return results[rows]
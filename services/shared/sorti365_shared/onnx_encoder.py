@@ -0,0 +1,140 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxEncoder:
+    """
+    Sentence encoder running on ONNX Runtime (CPU).
+
+    Drop-in replacement for the subset of SentenceTransformer.encode used by
+    this service: tokenizes with the fast tokenizer, runs the exported
+    transformer and mean-pools token embeddings.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantize: bool = False,
+        max_seq_length: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        # Imported here so the PyTorch backend does not require optimum
+        from transformers import AutoTokenizer
+
+        # Bare sentence-transformers names live under the org on the Hub
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id, use_fast=True)
+        # Truncate like SentenceTransformer unless overridden
+        self.max_seq_length = max_seq_length or self._model_max_seq_length(model_id)
+
+        # Exported (and quantized) models are kept per model under cache_dir
+        model_dir = Path(cache_dir) / model_id.replace("/", "--") if cache_dir else None
+        self.model = self._load(model_id, model_dir, quantize)
+
+    def _model_max_seq_length(self, model_id: str) -> int:
+        """The model's own max_seq_length, falling back to the tokenizer's limit."""
+        try:
+            config_path = Path(model_id) / "sentence_bert_config.json"
+            if not config_path.exists():
+                from huggingface_hub import hf_hub_download
+
+                config_path = Path(hf_hub_download(model_id, "sentence_bert_config.json"))
+            return int(json.loads(config_path.read_text())["max_seq_length"])
+        except (ImportError, OSError, KeyError, ValueError):
+            # Tokenizers without a configured limit report a huge sentinel
+            return min(self.tokenizer.model_max_length, 512)
+
+    def _load(self, model_id: str, model_dir: Optional[Path], quantize: bool):
+        """Load the ONNX model from the cache, exporting (and caching) it on a miss."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+
+        file_name = "model_quantized.onnx" if quantize else "model.onnx"
+        if model_dir is not None and (model_dir / file_name).exists():
+            logger.info(f"Loading cached ONNX model from {model_dir}")
+            return ORTModelForFeatureExtraction.from_pretrained(
+                model_dir, file_name=file_name, provider="CPUExecutionProvider"
+            )
+
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            model_id, export=True, provider="CPUExecutionProvider"
+        )
+        if quantize:
+            return self._quantize(model, model_dir)
+        if model_dir is not None:
+            model.save_pretrained(model_dir)
+        return model
+
+    def _quantize(self, model, model_dir: Optional[Path]):
+        """Apply dynamic INT8 quantization (VNNI kernels where available)."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        def quantize_into(save_dir: Path):
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=save_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=False
+                ),
+            )
+            logger.info(f"Quantized ONNX model to INT8 in {save_dir}")
+            return ORTModelForFeatureExtraction.from_pretrained(
+                save_dir, file_name="model_quantized.onnx", provider="CPUExecutionProvider"
+            )
+
+        if model_dir is not None:
+            return quantize_into(model_dir)
+        # Without a cache the files are only needed until the session has
+        # loaded them
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            return quantize_into(Path(tmp_dir))
+
+    def encode(
+        self,
+        sentences: list[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """Encode sentences into float32 embeddings, one row per sentence."""
+        # Smart batching: sort by length so each batch pads to a similar size
+        order = np.argsort([-len(s) for s in sentences], kind="stable")
+        embeddings: Optional[np.ndarray] = None
+
+        for start in range(0, len(sentences), batch_size):
+            batch_idx = order[start : start + batch_size]
+            features = self.tokenizer(
+                [sentences[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            token_embeddings = self.model(**features).last_hidden_state
+
+            # Mean pooling over non-padding tokens
+            mask = features["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+
+            if embeddings is None:
+                embeddings = np.empty((len(sentences), pooled.shape[1]), dtype=np.float32)
+            embeddings[batch_idx] = pooled
+
+        if embeddings is None:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if normalize_embeddings:
+            embeddings /= np.clip(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None
+            )
+        return embeddings
@@ -0,0 +1,33 @@
+# Python's (Unicode) \s without the newline, as a class body. RE2's \s and
+# \d are ASCII-only and Hyperscan's \s lacks \x1c-\x1f, so both engines get
+# explicit classes; anything narrower than `re` would drop real matches
+UNICODE_SPACE = (
+    r"\t\x0b\x0c\r\x1c-\x1f \x85\xa0\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+)
+
+
+def unicode_classes(expression: str) -> str:
+    """Rewrite \\d and \\s in a `re` pattern as the explicit classes `re` uses."""
+    expression = expression.replace(r"[^\S\n]", f"[{UNICODE_SPACE}]")
+    out: list[str] = []
+    in_class = False
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if char == "\\":
+            escape = expression[i:i + 2]
+            if escape == r"\d":
+                escape = r"\p{Nd}"
+            elif escape == r"\s":
+                escape = UNICODE_SPACE + r"\n" if in_class else f"[{UNICODE_SPACE}\\n]"
+            out.append(escape)
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        out.append(char)
+        i += 1
+    return "".join(out)